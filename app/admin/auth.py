@@ -2,13 +2,14 @@ from datetime import UTC, datetime
 
 from fastapi import Request, Response
 from jose import jwt
+from sqlalchemy import select
 from starlette_admin.auth import AuthProvider
 from starlette_admin.exceptions import LoginFailed
 
-from app.database import get_db
+from app.database import SessionLocal
 from app.models import User
 from app.utils import (
-    verify_password,
+    verify_password_async,
     generate_jwt_tokens,
     decode_jwt_token,
 )
@@ -24,8 +25,9 @@ class JSONAuthProvider(AuthProvider):
         request: Request,
         response: Response,
     ):
-        db = next(get_db())
-        user = db.query(User).filter(User.username == username).first()
+        async with SessionLocal() as db:
+            stmt = select(User).where(User.username == username)
+            user = (await db.execute(stmt)).scalars().first()
 
         if not user or user.is_deleted:
             raise LoginFailed("User not found.")
@@ -33,7 +35,7 @@ class JSONAuthProvider(AuthProvider):
         if user and not user.is_admin:
             raise LoginFailed("User is not admin.")
 
-        if not verify_password(password, user.password_hash):
+        if not await verify_password_async(password, user.password_hash):
             raise LoginFailed("Invalid password.")
 
         access_token, refresh_token = generate_jwt_tokens(user.id)
@@ -53,7 +55,6 @@ class JSONAuthProvider(AuthProvider):
             secure=True,
             samesite="lax",
         )
-        db.close()
 
         return response
 
@@ -69,8 +70,8 @@ class JSONAuthProvider(AuthProvider):
             if user_id is None:
                 return None
 
-            db = next(get_db())
-            user = db.query(User).filter(User.id == user_id).first()
+            async with SessionLocal() as db:
+                user = await db.get(User, int(user_id))
 
             if user is None or user.is_deleted or not user.is_admin:
                 return None
@@ -78,8 +79,8 @@ class JSONAuthProvider(AuthProvider):
             if payload.get("exp") < datetime.now(UTC).timestamp():
                 return None
 
-            db.close()
-
+            # view hook'lari (audit) uchun
+            request.state.user = user
             return user
 
         except jwt.JWTError:
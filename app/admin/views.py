@@ -1,15 +1,13 @@
-import os
-import uuid
 from typing import Any, Dict
+from fastapi import HTTPException
 from starlette.requests import Request
 from starlette_admin.contrib.sqla import ModelView
 from starlette.datastructures import UploadFile
+from starlette_admin.exceptions import FormValidationError
 from starlette_admin.fields import FileField, EnumField
-from app.utils import hash_password
-from app.models import Media
-
-
-UPLOAD_DIR = "media_uploads"
+from app.audit import audit
+from app.uploads import save_upload
+from app.utils import hash_password_async
 
 
 def looks_hashed(p: str):
@@ -53,29 +51,13 @@ class UserAdminView(ModelView):
     ) -> None:
         pwd = data.get("password_hash")
         if pwd and not looks_hashed(pwd):
-            obj.password_hash = hash_password(pwd)  # ASOSIY FIX
+            obj.password_hash = await hash_password_async(pwd)  # ASOSIY FIX
 
         session = request.state.session
 
-        up: UploadFile | None = extract_upload(data.get("img_file"))
-        if up:
-            os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-            filename = f"{uuid.uuid4().hex}{_safe_ext(up.filename)}"
-            path = os.path.join(UPLOAD_DIR, filename)
-
-            content = await up.read()
-            with open(path, "wb") as f:
-                f.write(content)
-
-            # BU URL app.mount(...) ga mos bo‘lishi shart
-            url = f"/{UPLOAD_DIR}/{filename}"
-
-            media = Media(url=url)
-            session.add(media)
-            session.flush([media])  # media.id olish uchun
-
-            obj.avatar_id = media.id
+        media_id = await upload_media(session, data)
+        if media_id:
+            obj.avatar_id = media_id
 
         data.pop("img_file", None)
 
@@ -87,28 +69,13 @@ class UserAdminView(ModelView):
             if not pwd:
                 return  # bo‘sh bo‘lsa o‘zgartirmaydi
             if not looks_hashed(pwd):
-                obj.password_hash = hash_password(pwd)
+                obj.password_hash = await hash_password_async(pwd)
 
         session = request.state.session
 
-        up: UploadFile | None = extract_upload(data.get("img_file"))
-        if up:
-            os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-            filename = f"{uuid.uuid4().hex}{_safe_ext(up.filename)}"
-            path = os.path.join(UPLOAD_DIR, filename)
-
-            content = await up.read()
-            with open(path, "wb") as f:
-                f.write(content)
-
-            url = f"/{UPLOAD_DIR}/{filename}"
-
-            media = Media(url=url)
-            session.add(media)
-            session.flush([media])
-
-            obj.avatar_id = media.id
+        media_id = await upload_media(session, data)
+        if media_id:
+            obj.avatar_id = media_id
 
         data.pop("img_file", None)
 
@@ -125,6 +92,18 @@ def extract_upload(v) -> UploadFile | None:
     return None
 
 
+async def upload_media(session, data: Dict[str, Any]) -> int | None:
+    """img_file maydonidagi faylni app.uploads orqali saqlab Media id qaytaradi."""
+    up: UploadFile | None = extract_upload(data.get("img_file"))
+    if not up:
+        return None
+    try:
+        media = await save_upload(session, up)
+    except HTTPException as e:
+        raise FormValidationError({"img_file": e.detail})
+    return media.id
+
+
 class MenuCategoryView(ModelView):
     fields = ["id", "name", "sort_order", "created_at", "updated_at"]
     exclude_fields_from_create = ["id", "created_at", "updated_at"]
@@ -132,11 +111,6 @@ class MenuCategoryView(ModelView):
     exclude_fields_from_detail = ["id", "sort_order", "created_at", "updated_at"]
 
 
-def _safe_ext(filename: str) -> str:
-    _, ext = os.path.splitext(filename or "")
-    return ext.lower()[:10] if ext else ""
-
-
 class MenuItemView(ModelView):
     fields = [
         "id",
@@ -174,25 +148,9 @@ class MenuItemView(ModelView):
             obj.category_id = cat.id if hasattr(cat, "id") else int(cat)
 
         # file upload
-        up: UploadFile | None = extract_upload(data.get("img_file"))
-        if up:
-            os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-            filename = f"{uuid.uuid4().hex}{_safe_ext(up.filename)}"
-            path = os.path.join(UPLOAD_DIR, filename)
-
-            content = await up.read()
-            with open(path, "wb") as f:
-                f.write(content)
-
-            # BU URL app.mount(...) ga mos bo‘lishi shart
-            url = f"/{UPLOAD_DIR}/{filename}"
-
-            media = Media(url=url)
-            session.add(media)
-            session.flush([media])  # media.id olish uchun
-
-            obj.img_id = media.id
+        media_id = await upload_media(session, data)
+        if media_id:
+            obj.img_id = media_id
 
         data.pop("img_file", None)
 
@@ -208,24 +166,9 @@ class MenuItemView(ModelView):
                 obj.category_id = cat.id if hasattr(cat, "id") else int(cat)
 
         # file upload (agar yangi rasm yuklansa)
-        up: UploadFile | None = extract_upload(data.get("img_file"))
-        if up:
-            os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-            filename = f"{uuid.uuid4().hex}{_safe_ext(up.filename)}"
-            path = os.path.join(UPLOAD_DIR, filename)
-
-            content = await up.read()
-            with open(path, "wb") as f:
-                f.write(content)
-
-            url = f"/{UPLOAD_DIR}/{filename}"
-
-            media = Media(url=url)
-            session.add(media)
-            session.flush([media])
-
-            obj.img_id = media.id
+        media_id = await upload_media(session, data)
+        if media_id:
+            obj.img_id = media_id
 
         data.pop("img_file", None)
 
@@ -251,7 +194,45 @@ class TableViews(ModelView):
     exclude_fields_from_list = ["updated_at", "created_at", "id"]
 
 
-class PaymentView(ModelView):
+class AuditedView(ModelView):
+    """Admin panel orqali yaratish/tahrirlash/o'chirishni audit log'ga yozadi."""
+
+    audit_entity: str = ""
+
+    def audit_meta(self, obj: Any) -> dict:
+        return {"via": "admin"}
+
+    def _audit(self, request: Request, obj: Any, action: str):
+        user = getattr(request.state, "user", None)
+        audit.log(
+            user.id if user else None,
+            self.audit_entity,
+            obj.id,
+            action,
+            self.audit_meta(obj),
+        )
+
+    async def after_create(self, request: Request, obj: Any) -> None:
+        self._audit(request, obj, "create")
+
+    async def after_edit(self, request: Request, obj: Any) -> None:
+        self._audit(request, obj, "edit")
+
+    async def after_delete(self, request: Request, obj: Any) -> None:
+        self._audit(request, obj, "delete")
+
+
+class PaymentView(AuditedView):
+    audit_entity = "payment"
+
+    def audit_meta(self, obj: Any) -> dict:
+        return {
+            "via": "admin",
+            "order_id": obj.order_id,
+            "method": obj.method,
+            "amount": float(obj.amount) if obj.amount is not None else None,
+        }
+
     fields = [
         "id",
         "order",
@@ -268,12 +249,12 @@ class PaymentView(ModelView):
     ]
 
 
-class OrdersView(ModelView):
-    pass
+class OrdersView(AuditedView):
+    audit_entity = "order"
 
 
-class OrderItemView(ModelView):
-    pass
+class OrderItemView(AuditedView):
+    audit_entity = "order_item"
 
 
 class MenuVariantView(ModelView):
@@ -0,0 +1,225 @@
+"""
+Audit log yozuvchisi.
+
+So'rovlar ``audit.log(...)`` bilan eventni navbatga qo'yadi va kutmaydi;
+fon task'i ularni ``AUDIT_BATCH_SIZE`` tadan yoki har ``AUDIT_FLUSH_SECONDS``
+da bitta multi-row INSERT bilan yozadi. Baza rad etgan event batch'ni
+yo'qotmaydi: faqat o'zi tashlanadi. To'xtashda navbat oxirigacha yoziladi.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, date, datetime
+
+from sqlalchemy import insert, text
+from sqlalchemy.exc import DataError, IntegrityError
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models import AuditLog
+
+
+logger = logging.getLogger(__name__)
+
+
+class AuditStats:
+    def __init__(self):
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self.flushes = 0
+
+    def as_dict(self, queued: int) -> dict:
+        return {
+            "queued": queued,
+            "written": self.written,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "flushes": self.flushes,
+        }
+
+
+class AuditWriter:
+    def __init__(self, maxsize: int, batch_size: int, interval: float):
+        self._queue: asyncio.Queue[dict] = asyncio.Queue(maxsize=maxsize)
+        self._batch_size = batch_size
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+        self._pending: list[dict] = []
+        self._flushing = False
+        self._closing = False
+        self.stats = AuditStats()
+
+    def log(
+        self,
+        user_id: int | None,
+        entity: str,
+        entity_id: int,
+        action: str,
+        meta: dict | None = None,
+    ):
+        now = datetime.now(UTC)
+        event = {
+            "user_id": user_id,
+            "entity": entity,
+            "entity_id": entity_id,
+            "action": action,
+            "meta": meta or {},
+            "created_at": now,
+            "updated_at": now,
+        }
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # so'rovni to'xtatmaymiz: baza sekinlashgan, event tashlanadi
+            self.stats.dropped += 1
+            logger.warning(
+                "Audit queue full, dropped %s %s %s", entity, entity_id, action
+            )
+
+    def start(self):
+        self._closing = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Navbatdagi hamma eventlarni yozib to'xtaydi (lifespan shutdown)."""
+        self._closing = True
+        if self._task is not None:
+            # yozish paytida uzmaymiz: batch tugagach _run o'zi chiqadi
+            if not self._flushing:
+                self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        batch, self._pending = self._pending, []
+        while batch or not self._queue.empty():
+            batch += self._take(self._batch_size - len(batch))
+            await self._flush(batch)
+            batch = []
+
+    def as_dict(self) -> dict:
+        return self.stats.as_dict(self._queue.qsize() + len(self._pending))
+
+    def _take(self, limit: int) -> list[dict]:
+        batch = []
+        while len(batch) < limit and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _collect(self):
+        # birinchi eventdan keyin interval kutamiz yoki batch to'lguncha;
+        # olinganlar _pending'da turadi, cancel bo'lsa ham yo'qolmaydi
+        self._pending.append(await self._queue.get())
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self._interval
+        while len(self._pending) < self._batch_size:
+            self._pending += self._take(self._batch_size - len(self._pending))
+            timeout = deadline - loop.time()
+            if len(self._pending) >= self._batch_size or timeout <= 0:
+                return
+            try:
+                self._pending.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                return
+
+    async def _run(self):
+        while not self._closing:
+            await self._collect()
+            self._flushing = True
+            try:
+                await self._flush(self._pending)
+            finally:
+                self._pending = []
+                self._flushing = False
+
+    async def _flush(self, batch: list[dict]):
+        if not batch:
+            return
+        try:
+            async with SessionLocal() as session:
+                await session.execute(insert(AuditLog), batch)
+                await session.commit()
+        except (IntegrityError, DataError):
+            # bitta yomon event (masalan, yo'q user_id) butun batch'ni
+            # yo'qotmasin: ikkiga bo'lib qayta yozamiz, faqat o'zi tashlanadi
+            if len(batch) == 1:
+                self.stats.failed += 1
+                logger.exception("Audit event rejected, dropped: %s", batch[0])
+                return
+            middle = len(batch) // 2
+            await self._flush(batch[:middle])
+            await self._flush(batch[middle:])
+            return
+        except Exception:
+            self.stats.failed += len(batch)
+            logger.exception("Audit flush failed, %s events lost", len(batch))
+            return
+        self.stats.written += len(batch)
+        self.stats.flushes += 1
+
+
+audit = AuditWriter(
+    maxsize=settings.AUDIT_QUEUE_SIZE,
+    batch_size=settings.AUDIT_BATCH_SIZE,
+    interval=settings.AUDIT_FLUSH_SECONDS,
+)
+
+
+PARTITION_CHECK_SECONDS = 24 * 60 * 60
+# bir nechta worker bir vaqtda partition yaratmasin
+PARTITION_LOCK_ID = 0x617564697400
+
+
+def _add_months(month: date, count: int) -> date:
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"audit_log_y{month:%Y}m{month:%m}"
+
+
+async def ensure_partitions(now: datetime | None = None):
+    """Joriy oy va keyingi AUDIT_PARTITIONS_AHEAD oy uchun partition yaratadi,
+    AUDIT_RETENTION_MONTHS dan eskilarini o'chiradi."""
+    today = (now or datetime.now(UTC)).date()
+    current = today.replace(day=1)
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(:id)"), {"id": PARTITION_LOCK_ID}
+        )
+        for i in range(settings.AUDIT_PARTITIONS_AHEAD + 1):
+            month = _add_months(current, i)
+            await conn.execute(
+                text(
+                    f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+                    "PARTITION OF audit_log FOR VALUES "
+                    f"FROM ('{month}') TO ('{_add_months(month, 1)}')"
+                )
+            )
+
+        if settings.AUDIT_RETENTION_MONTHS <= 0:
+            return
+        oldest = partition_name(_add_months(current, -settings.AUDIT_RETENTION_MONTHS))
+        res = await conn.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'audit_log'::regclass"
+            )
+        )
+        # audit_log_yYYYYmMM nomlari satr sifatida ham xronologik tartiblanadi
+        for (name,) in res:
+            if name < oldest:
+                await conn.execute(text(f"DROP TABLE {name}"))
+                logger.info("Audit partition %s dropped (retention)", name)
+
+
+async def maintain_partitions():
+    while True:
+        try:
+            await ensure_partitions()
+        except Exception:
+            logger.exception("Audit partition maintenance failed")
+        await asyncio.sleep(PARTITION_CHECK_SECONDS)
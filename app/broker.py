@@ -0,0 +1,149 @@
+import asyncio
+import json
+import uuid
+from collections import deque
+from typing import Awaitable, Callable
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+
+HEARTBEAT_SECONDS = 15
+
+
+class Subscriber:
+    def __init__(self, topic: str, maxsize: int = 1000):
+        self.topic = topic
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+
+
+class EventBroker:
+    """Topic bo'yicha in-process pub/sub (NOTIFY'dan kelgan eventlar uchun).
+
+    Har bir event (seq, topic, json) halqali buferga yoziladi; qayta
+    ulangan klient ``epoch:seq`` bilan shu joydan davom etadi. Epoch
+    boshqa bo'lsa (boshqa worker, restart) yoki bufer yetmasa snapshot olinadi.
+    """
+
+    def __init__(self, buffer_size: int = 5000):
+        self.epoch = uuid.uuid4().hex[:8]
+        self.seq = 0
+        self._buffer: deque[tuple[int, str, str]] = deque(maxlen=buffer_size)
+        self._subscribers: set[Subscriber] = set()
+
+    def event_id(self, seq: int) -> str:
+        return f"{self.epoch}:{seq}"
+
+    def subscribe(self, topic: str) -> Subscriber:
+        sub = Subscriber(topic)
+        self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        self._subscribers.discard(sub)
+
+    def publish(self, topic: str, data: str):
+        self.seq += 1
+        self._buffer.append((self.seq, topic, data))
+        for sub in list(self._subscribers):
+            if sub.topic != topic:
+                continue
+            try:
+                sub.queue.put_nowait((self.seq, data))
+            except asyncio.QueueFull:
+                # sekin klient: uzamiz, qayta ulanib buferdan/snapshotdan oladi
+                self._close(sub)
+
+    def replay(self, topic: str, last_event_id: str | None):
+        """Buferdagi ``last_event_id`` dan keyingi eventlar yoki None."""
+        epoch, _, seq = (last_event_id or "").partition(":")
+        if epoch != self.epoch or not seq.isdigit():
+            return None
+        seq = int(seq)
+        if self._buffer and seq < self._buffer[0][0] - 1:
+            return None
+        return [(s, data) for s, t, data in self._buffer if s > seq and t == topic]
+
+    def reset(self):
+        """NOTIFY yo'qolgan bo'lishi mumkin: hammani snapshotga qaytaramiz."""
+        self.epoch = uuid.uuid4().hex[:8]
+        self._buffer.clear()
+        for sub in list(self._subscribers):
+            self._close(sub)
+
+    def _close(self, sub: Subscriber):
+        self._subscribers.discard(sub)
+        while not sub.queue.empty():
+            sub.queue.get_nowait()
+        sub.queue.put_nowait(None)
+
+
+def _sse(data: str, event_id: str | None = None, event: str | None = None) -> str:
+    lines = []
+    if event_id:
+        lines.append(f"id: {event_id}")
+    if event:
+        lines.append(f"event: {event}")
+    lines.append(f"data: {data}")
+    return "\n".join(lines) + "\n\n"
+
+
+async def sse_stream(
+    request: Request,
+    broker: EventBroker,
+    topic: str,
+    last_event_id: str | None,
+    load_snapshot: Callable[[], Awaitable[object]],
+    event: str,
+) -> StreamingResponse:
+    """
+    Avval ``snapshot`` eventi, keyin har bir o'zgarish ``event`` nomi bilan.
+    Qayta ulanishda bufer yetsa faqat o'tkazib yuborilgan eventlar yuboriladi.
+    """
+    sub = broker.subscribe(topic)
+    # obunadan keyin o'qiymiz: oradagi eventlar navbatda qoladi
+    missed = broker.replay(topic, last_event_id)
+    # snapshot davomida kelgan eventlar ham yuboriladi (id bo'yicha idempotent)
+    seq = broker.seq
+    snapshot = None
+    if missed is None:
+        try:
+            snapshot = await load_snapshot()
+        except BaseException:
+            broker.unsubscribe(sub)
+            raise
+
+    async def events():
+        try:
+            if snapshot is not None:
+                yield _sse(json.dumps(snapshot), broker.event_id(seq), "snapshot")
+                last = seq
+            else:
+                last = 0
+                for last, data in missed:
+                    yield _sse(data, broker.event_id(last), event)
+
+            while True:
+                try:
+                    msg = await asyncio.wait_for(sub.queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": ping\n\n"
+                    continue
+                if msg is None:
+                    # broker qayta ishga tushdi yoki klient orqada qoldi
+                    return
+                event_seq, data = msg
+                if event_seq <= last:
+                    continue
+                last = event_seq
+                yield _sse(data, broker.event_id(event_seq), event)
+        finally:
+            broker.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,133 @@
+"""
+Javob siqish: Accept-Encoding bo'yicha br (brotli o'rnatilgan bo'lsa) yoki gzip.
+
+``CompressionMiddleware`` ``COMPRESS_MIN_BYTES`` dan katta javoblarni har
+so'rovda siqadi (Starlette GZipMiddleware mexanikasi: streaming, SSE va
+Content-Encoding'i bor javoblar chetlab o'tiladi; /static/uploads ham).
+Cache qilinadigan snapshot'lar (menyu, stollar) ``Precompressed`` orqali bir
+marta siqiladi (NOTIFY bilan yashaydiganlari eng yuqori darajada) va keyin
+tayyor baytlar beriladi.
+"""
+
+import asyncio
+import gzip
+
+from fastapi import Request, Response
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipResponder, IdentityResponder
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.config import settings
+from app.uploads import UPLOAD_URL
+
+try:
+    import brotli
+except ImportError:  # ixtiyoriy: pip install .[brotli]
+    brotli = None
+
+
+def choose_encoding(accept_encoding: str) -> str | None:
+    """Klient qabul qiladigan eng yaxshi kodlash (q=0 lar hisobga olinmaydi)."""
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        accepted.add(name.strip())
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+    return None
+
+
+def compress(body: bytes, encoding: str, best: bool = True) -> bytes:
+    """Bir martalik (snapshot) siqish: eng kichik hajm uchun eng yuqori daraja,
+    ``best=False`` bo'lsa middleware darajasi (qisqa yashaydigan body)."""
+    if encoding == "br":
+        quality = 11 if best else settings.BROTLI_QUALITY
+        return brotli.compress(body, mode=brotli.MODE_TEXT, quality=quality)
+    return gzip.compress(body, compresslevel=9 if best else settings.GZIP_LEVEL)
+
+
+class BrotliResponder(IdentityResponder):
+    content_encoding = "br"
+
+    def __init__(self, app: ASGIApp, minimum_size: int, quality: int):
+        super().__init__(app, minimum_size)
+        self.compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality)
+
+    async def apply_compression(self, body: bytes, *, more_body: bool) -> bytes:
+        data = self.compressor.process(body)
+        if more_body:
+            return data + self.compressor.flush()
+        return data + self.compressor.finish()
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = settings.COMPRESS_MIN_BYTES,
+        gzip_level: int = settings.GZIP_LEVEL,
+        brotli_quality: int = settings.BROTLI_QUALITY,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        # yuklangan fayllar allaqachon siqilgan rasmlar (Range ham buzilmasin);
+        # webp variantini app.static o'zi tanlaydi
+        if scope["type"] != "http" or scope["path"].startswith(UPLOAD_URL):
+            await self.app(scope, receive, send)
+            return
+
+        encoding = choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding == "br":
+            responder = BrotliResponder(
+                self.app, self.minimum_size, quality=self.brotli_quality
+            )
+        elif encoding == "gzip":
+            responder = GZipResponder(
+                self.app, self.minimum_size, compresslevel=self.gzip_level
+            )
+        else:
+            responder = IdentityResponder(self.app, self.minimum_size)
+        await responder(scope, receive, send)
+
+
+class Precompressed:
+    """Tayyor body va uning siqilgan nusxalari (har kodlash bir marta)."""
+
+    def __init__(self, body: bytes, media_type: str = "application/json"):
+        self.body = body
+        self.media_type = media_type
+        # False: body tez almashadi, eng yuqori daraja o'zini oqlamaydi
+        self.best = True
+        self._encoded: dict[str, bytes] = {}
+
+    async def encoded(self, encoding: str) -> bytes:
+        body = self._encoded.get(encoding)
+        if body is None:
+            # katta menyuda brotli 11 sekin: event loop'ni to'xtatmaymiz
+            body = await asyncio.to_thread(compress, self.body, encoding, self.best)
+            self._encoded[encoding] = body
+        return body
+
+    def encoding_for(self, request: Request) -> str | None:
+        """Shu so'rovga beriladigan kodlash; kichik body siqilmaydi."""
+        if len(self.body) < settings.COMPRESS_MIN_BYTES:
+            return None
+        return choose_encoding(request.headers.get("accept-encoding", ""))
+
+    async def response(self, request: Request, headers: dict) -> Response:
+        encoding = self.encoding_for(request)
+        if encoding is None:
+            # Vary'ni (kerak bo'lsa) middleware qo'shadi
+            return Response(self.body, media_type=self.media_type, headers=headers)
+        headers = {**headers, "Content-Encoding": encoding, "Vary": "Accept-Encoding"}
+        return Response(
+            await self.encoded(encoding), media_type=self.media_type, headers=headers
+        )
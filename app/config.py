@@ -5,13 +5,49 @@ class Settings(BaseSettings):
     PROJECT_NAME: str
     DEBUG: bool
     MEDIA_PATH: str = "media_uploads/"
+    UPLOAD_MAX_BYTES: int = 10 * 1024 * 1024
+    # rasm variantlari (app.images): kengliklar va worker processlar soni
+    IMAGE_WIDTHS: list[int] = [120, 320, 640]
+    IMAGE_WORKERS: int = 2
+    IMAGE_BATCH_SIZE: int = 10
+    IMAGE_SCAN_SECONDS: int = 300
+    # shundan eski "ishlanmoqda" belgisi (worker o'lgan) qayta olinadi
+    IMAGE_CLAIM_SECONDS: int = 600
     BASE_URL: str = "https://ziyofat.uz"
 
     SESSION_ID_EXPIRE_DAYS: int = 1
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
+    TOKEN_BLACKLIST_PURGE_MINUTES: int = 60
+    # Idempotency-Key javoblari shuncha saqlanadi (app.idempotency)
+    IDEMPOTENCY_TTL_HOURS: int = 24
+    IDEMPOTENCY_PURGE_MINUTES: int = 60
+    # javobsiz kalit shundan keyin "bajarilgan, javob yo'q" (worker o'lgan) deb olinadi
+    IDEMPOTENCY_LEASE_SECONDS: int = 30
+    ORDERS_PAGE_SIZE: int = 50
+    ORDERS_MAX_PAGE_SIZE: int = 200
+    # javob siqish (app.compression): shundan kichik javoblar siqilmaydi
+    COMPRESS_MIN_BYTES: int = 1024
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 5
+    # LISTEN bo'lmasa (DB_PGBOUNCER) menyu/stollar snapshot'i shuncha qayta ishlatiladi
+    SNAPSHOT_TTL_SECONDS: float = 1.0
+    # eksportda server-side cursor'dan bir marta olinadigan qatorlar soni
+    EXPORT_CHUNK_SIZE: int = 5000
+
+    AUDIT_QUEUE_SIZE: int = 10000
+    AUDIT_BATCH_SIZE: int = 500
+    AUDIT_FLUSH_SECONDS: float = 1.0
+    # audit_log oylik partitionlari: oldindan yaratiladigan va saqlanadigan oylar
+    AUDIT_PARTITIONS_AHEAD: int = 3
+    AUDIT_RETENTION_MONTHS: int = 0  # 0 - hech qachon o'chirilmaydi
+
+    USER_CACHE_SIZE: int = 1024
+    USER_CACHE_TTL_SECONDS: int = 300
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
+    # argon2 hisoblash uchun threadlar soni (argon2-cffi GIL'ni qo'yib yuboradi)
+    PASSWORD_HASH_WORKERS: int = 4
 
     DB_USER: str
     DB_PASSWORD: str
@@ -19,6 +55,14 @@ class Settings(BaseSettings):
     DB_PORT: int
     DB_NAME: str
 
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # PgBouncer transaction pooling: server-side prepared statements o'chiriladi
+    DB_PGBOUNCER: bool = False
+
     class Config:
         env_file = ".env"
 
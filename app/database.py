@@ -1,36 +1,112 @@
-import os
+import time
+import uuid
 from fastapi import Depends
 from typing import Annotated
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session, DeclarativeBase
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.util.queue import AsyncAdaptedQueue, Empty
+from app.config import settings
 
-load_dotenv()
 
+DB_URL = (
+    f"postgresql+asyncpg://{settings.DB_USER}:{settings.DB_PASSWORD}"
+    f"@{settings.DB_HOST}:{settings.DB_PORT}/{settings.DB_NAME}"
+)
 
-DB_USER = os.getenv("DB_USER")
-DB_PASSWORD = os.getenv("DB_PASSWORD")
-DB_HOST = os.getenv("DB_HOST")
-DB_PORT = os.getenv("DB_PORT")
-DB_NAME = os.getenv("DB_NAME")
 
-DB_URL = f"postgresql+psycopg2://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+class PoolStats:
+    """Pool'dan connection olishda kutilgan vaqt statistikasi."""
 
-engine = create_engine(DB_URL)
+    def __init__(self):
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
 
-SessionLocal = sessionmaker(autocommit=False, bind=engine, autoflush=False)
+    def record(self, wait: float, timed_out: bool = False):
+        self.checkouts += 1
+        self.timeouts += int(timed_out)
+        self.wait_total += wait
+        self.wait_max = max(self.wait_max, wait)
+
+
+pool_stats = PoolStats()
+
+
+class TimedQueue(AsyncAdaptedQueue):
+    """Pool navbati: bo'sh connection kutilgan vaqtni o'lchaydi. Yangi ulanish
+    ochish va pre-ping bunga kirmaydi (ular sekin tarmoqni ko'rsatadi, pool
+    tugaganini emas)."""
+
+    def get(self, block: bool = True, timeout: float | None = None):
+        start = time.perf_counter()
+        try:
+            entry = super().get(block, timeout)
+        except Empty:
+            # block=False: navbat bo'sh, overflow bor - yangi connection ochiladi
+            pool_stats.record(time.perf_counter() - start, timed_out=block)
+            raise
+        pool_stats.record(time.perf_counter() - start)
+        return entry
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    _queue_class = TimedQueue
+
+
+def _connect_args() -> dict:
+    if not settings.DB_PGBOUNCER:
+        return {}
+    # PgBouncer transaction mode'da prepared statement'lar connectionlar
+    # orasida saqlanmaydi, shuning uchun asyncpg cache'ini o'chiramiz
+    return {
+        "statement_cache_size": 0,
+        "prepared_statement_cache_size": 0,
+        "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+    }
+
+
+engine = create_async_engine(
+    DB_URL,
+    poolclass=TimedQueuePool,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    connect_args=_connect_args(),
+)
+
+SessionLocal = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+
+def get_pool_status() -> dict:
+    pool = engine.sync_engine.pool
+    return {
+        "size": pool.size(),
+        "checked_out": pool.checkedout(),
+        "checked_in": pool.checkedin(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "checkouts": pool_stats.checkouts,
+        "timeouts": pool_stats.timeouts,
+        "wait_avg_ms": (
+            pool_stats.wait_total / pool_stats.checkouts * 1000
+            if pool_stats.checkouts
+            else 0.0
+        ),
+        "wait_max_ms": pool_stats.wait_max * 1000,
+    }
 
 
 class Base(DeclarativeBase):
     pass
 
 
-def get_db():
-    try:
-        session = SessionLocal()
+async def get_db():
+    async with SessionLocal() as session:
         yield session
-    finally:
-        session.close()
 
 
-db_dep = Annotated[Session, Depends(get_db)]
+db_dep = Annotated[AsyncSession, Depends(get_db)]
@@ -6,21 +6,28 @@ from fastapi import HTTPException, Depends
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
 from app.database import db_dep
 from app.models import User, TokenBlacklist
-from app.utils import decode_jwt_token
+from app.schemas import AuthUser
+from app.token_cache import revocation_cache
+from app.user_cache import user_cache, to_auth_user
+from app.utils import decode_jwt_token, hash_token
 
 
 jwt_security = HTTPBearer(auto_error=False)
 
 
-def get_current_user_jwt(
+async def get_current_user_jwt(
     session: db_dep, credentials: HTTPAuthorizationCredentials = Depends(jwt_security)
 ):
     if not credentials:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     token = credentials.credentials
-    stmt = select(TokenBlacklist).where(TokenBlacklist.token == token)
-    if session.execute(stmt).scalar():
+    token_hash = hash_token(token)
+    revoked = revocation_cache.is_revoked(token_hash)
+    if revoked is None:
+        stmt = select(TokenBlacklist).where(TokenBlacklist.token_hash == token_hash)
+        revoked = (await session.execute(stmt)).scalar() is not None
+    if revoked:
         raise HTTPException(status_code=401, detail="Token in blacklist")
 
     decoded = decode_jwt_token(credentials.credentials)
@@ -30,8 +37,14 @@ def get_current_user_jwt(
     if exp < datetime.now(timezone.utc):
         raise HTTPException(status_code=401, detail="Token expired.")
 
-    stmt = select(User).where(User.id == user_id).options(joinedload(User.avatar))
-    user = session.execute(stmt).scalars().first()
+    user = user_cache.get(int(user_id))
+    if user is None:
+        generation = user_cache.generation
+        stmt = select(User).where(User.id == user_id).options(joinedload(User.avatar))
+        db_user = (await session.execute(stmt)).scalars().first()
+        if db_user:
+            user = to_auth_user(db_user)
+            user_cache.set(user, generation)
 
     if not user or user.is_deleted:
         raise HTTPException(status_code=404, detail="User not found")
@@ -39,4 +52,13 @@ def get_current_user_jwt(
     return user
 
 
-current_user = Annotated[User, Depends(get_current_user_jwt)]
+current_user = Annotated[AuthUser, Depends(get_current_user_jwt)]
+
+
+async def get_current_admin_jwt(user: current_user):
+    if not user.is_admin:
+        raise HTTPException(status_code=403, detail="Admin only")
+    return user
+
+
+admin_user = Annotated[AuthUser, Depends(get_current_admin_jwt)]
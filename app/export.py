@@ -0,0 +1,160 @@
+"""
+Buyurtma va to'lovlarni oqim bilan eksport qilish.
+
+Qatorlar server-side cursor'dan ``EXPORT_CHUNK_SIZE`` tadan o'qiladi va
+darhol CSV/Parquet bo'lagi sifatida yuboriladi: xotira sana oralig'iga
+bog'liq emas.
+"""
+
+import csv
+import io
+from datetime import datetime
+from decimal import Decimal
+from typing import AsyncIterator
+
+from sqlalchemy import Select, select
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Order, OrderItem, Payment
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pip install ziyofat-day[parquet]
+    pa = pq = None
+
+
+ORDER_COLUMNS = [
+    Order.id,
+    Order.table_id,
+    Order.waiter_id,
+    Order.status,
+    Order.opened_at,
+    Order.submitted_at,
+    Order.closed_at,
+    Order.notes,
+]
+ORDER_ITEM_COLUMNS = [
+    OrderItem.id,
+    OrderItem.order_id,
+    OrderItem.menu_item_id,
+    OrderItem.variant_id,
+    OrderItem.qty,
+    OrderItem.unit_price,
+    OrderItem.status,
+    OrderItem.note,
+    OrderItem.sent_at,
+    OrderItem.ready_at,
+    OrderItem.served_at,
+]
+PAYMENT_COLUMNS = [
+    Payment.id,
+    Payment.order_id,
+    Payment.cashier_id,
+    Payment.method,
+    Payment.amount,
+    Payment.paid_at,
+    Payment.receipt_no,
+]
+
+
+def export_query(dataset: str, date_from: datetime, date_to: datetime) -> Select:
+    """Buyurtmalar va qatorlar opened_at, to'lovlar paid_at bo'yicha filtrlanadi."""
+    if dataset == "orders":
+        return (
+            select(*ORDER_COLUMNS)
+            .where(Order.opened_at >= date_from, Order.opened_at < date_to)
+            .order_by(Order.opened_at, Order.id)
+        )
+    if dataset == "order_items":
+        return (
+            select(*ORDER_ITEM_COLUMNS)
+            .join(Order, Order.id == OrderItem.order_id)
+            .where(Order.opened_at >= date_from, Order.opened_at < date_to)
+            .order_by(Order.opened_at, OrderItem.id)
+        )
+    return (
+        select(*PAYMENT_COLUMNS)
+        .where(Payment.paid_at >= date_from, Payment.paid_at < date_to)
+        .order_by(Payment.paid_at, Payment.id)
+    )
+
+
+async def _partitions(stmt: Select) -> AsyncIterator[list]:
+    # response uzoq davom etadi: so'rov sessiyasiga emas, o'z sessiyasiga bog'lanadi
+    async with SessionLocal() as session:
+        result = await session.stream(
+            stmt.execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+        )
+        async for rows in result.partitions():
+            yield rows
+
+
+async def csv_chunks(stmt: Select) -> AsyncIterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([c.name for c in stmt.selected_columns])
+
+    async for rows in _partitions(stmt):
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _Sink(io.RawIOBase):
+    """ParquetWriter yozganlarini yig'adi, har row group'dan keyin bo'shatiladi."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+        self._pos = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._pos += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._pos
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _arrow_type(column):
+    python_type = column.type.python_type
+    if python_type is int:
+        return pa.int64()
+    if python_type is Decimal:
+        return pa.float64()
+    if python_type is datetime:
+        return pa.timestamp("us")
+    return pa.string()
+
+
+async def parquet_chunks(stmt: Select) -> AsyncIterator[bytes]:
+    columns = list(stmt.selected_columns)
+    schema = pa.schema([(c.name, _arrow_type(c)) for c in columns])
+    sink = _Sink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    async for rows in _partitions(stmt):
+        data = {
+            c.name: [float(v) if isinstance(v, Decimal) else v for v in values]
+            for c, values in zip(columns, zip(*rows))
+        }
+        # har bir partition alohida row group
+        writer.write_table(pa.Table.from_pydict(data, schema=schema))
+        yield sink.drain()
+
+    writer.close()
+    yield sink.drain()
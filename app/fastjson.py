@@ -0,0 +1,36 @@
+"""
+Ko'p qatorli GET endpointlar uchun tez JSON yo'li.
+
+Odatdagi yo'l: ORM obyekt -> Pydantic validatsiya -> JSON. Bu yerda SELECT
+ustunlari (tuple) to'g'ridan-to'g'ri dict'ga aylanadi va orjson bilan
+kodlanadi. Endpoint ``response_model``'ni saqlaydi (OpenAPI sxemasi shu
+bo'yicha), lekin tayyor Response qaytargani uchun FastAPI uni qayta
+validatsiya qilmaydi: ustun nomlari schema maydonlariga mos bo'lishi kerak.
+"""
+
+from decimal import Decimal
+
+import orjson
+from fastapi import Response
+from sqlalchemy.engine import Result
+
+
+def _default(value):
+    # Numeric ustunlar: schema'larda float
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError
+
+
+def rows(result: Result) -> list[dict]:
+    """SELECT natijasi -> [{ustun: qiymat}, ...] (label'lar schema nomlari)."""
+    keys = list(result.keys())
+    return [dict(zip(keys, row)) for row in result]
+
+
+def json_response(content, headers: dict | None = None) -> Response:
+    return Response(
+        content=orjson.dumps(content, default=_default),
+        media_type="application/json",
+        headers=headers,
+    )
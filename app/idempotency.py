@@ -0,0 +1,201 @@
+"""
+Idempotency-Key: beqaror Wi-Fi'da qayta yuborilgan mutatsiyalar bir marta bajariladi.
+
+Router ``route_class=IdempotentRoute`` bilan ulanadi. Header bo'lsa:
+
+1. Kalit bazada javobi bilan bor bo'lsa endpoint chaqirilmaydi, saqlangan
+   javob ``Idempotent-Replayed: true`` bilan qaytadi.
+2. Aks holda kalit so'rovning o'z sessiyasida (commit'siz) band qilinadi:
+   endpoint commit qilganda mutatsiya bilan birga yoziladi, xato bo'lsa
+   birga rollback bo'ladi. Parallel dublikat shu INSERT'da birinchisini
+   kutadi va 409 oladi.
+3. Endpoint javobi alohida qisqa tranzaksiyada kalitga yoziladi.
+4. Javobsiz kalit faqat mutatsiya commit bo'lgandan keyin ko'rinadi, shuning
+   uchun endpoint qayta chaqirilmaydi. ``IDEMPOTENCY_LEASE_SECONDS`` ichida
+   javob hali yozilayotgan bo'lishi mumkin (409, Retry-After). Undan keyin
+   javob yo'qolgan (``_store`` xatosi, worker o'ldi): 409 "bajarilgan, javob
+   yo'q", klient natijani GET bilan tekshiradi.
+
+Yozuvlar ``IDEMPOTENCY_TTL_HOURS`` dan keyin o'chiriladi.
+"""
+
+import asyncio
+import hashlib
+import logging
+from datetime import UTC, datetime, timedelta
+
+from fastapi import Depends, HTTPException, Request, Response
+from fastapi.routing import APIRoute
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.config import settings
+from app.database import SessionLocal, db_dep
+from app.models import IdempotencyKey
+
+
+logger = logging.getLogger(__name__)
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+MUTATING_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+
+def _in_progress() -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail=f"A request with this {HEADER} is already in progress",
+        headers={"Retry-After": "1"},
+    )
+
+
+def _completed_without_response() -> HTTPException:
+    return HTTPException(
+        status_code=409,
+        detail=f"The request with this {HEADER} was completed, "
+        "but its response is not available",
+    )
+
+
+def _response_lost():
+    """Javobi yozilmagan va lease'i o'tgan kalit (mutatsiya commit bo'lgan)."""
+    lease = timedelta(seconds=settings.IDEMPOTENCY_LEASE_SECONDS)
+    return and_(
+        IdempotencyKey.status_code.is_(None),
+        IdempotencyKey.claimed_at < func.now() - lease,
+    )
+
+
+async def _request_hash(request: Request) -> str:
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request.url.path}?{request.url.query}\n".encode())
+    # body Request'da keshlanadi, endpoint uni qayta o'qiy oladi
+    digest.update(await request.body())
+    return digest.hexdigest()
+
+
+def _replay(row: IdempotencyKey) -> Response:
+    return Response(
+        content=row.body,
+        status_code=row.status_code,
+        media_type=row.content_type,
+        headers={"Idempotent-Replayed": "true"},
+    )
+
+
+async def claim_key(request: Request, session: db_dep):
+    """Kalitni so'rov sessiyasida band qiladi (endpoint commit'i bilan yoziladi)."""
+    idem = getattr(request.state, "idempotency", None)
+    if idem is None:
+        return
+    key, request_hash = idem
+    expires_at = datetime.now(UTC) + timedelta(hours=settings.IDEMPOTENCY_TTL_HOURS)
+
+    stmt = pg_insert(IdempotencyKey).values(
+        key=key, request_hash=request_hash, expires_at=expires_at, claimed_at=func.now()
+    )
+    # faqat muddati o'tgan kalit qayta ishlatiladi: javobsiz kalitning
+    # mutatsiyasi commit bo'lgan, qayta bajarilsa dublikat yoziladi
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IdempotencyKey.key],
+        set_={
+            "request_hash": stmt.excluded.request_hash,
+            "status_code": None,
+            "content_type": None,
+            "body": None,
+            "expires_at": stmt.excluded.expires_at,
+            "claimed_at": stmt.excluded.claimed_at,
+        },
+        where=IdempotencyKey.expires_at < func.now(),
+    ).returning(IdempotencyKey.key)
+
+    if await session.scalar(stmt) is None:
+        raise _in_progress()
+
+
+async def _store(key: str, response: Response):
+    if not 200 <= response.status_code < 500 or not hasattr(response, "body"):
+        return
+    try:
+        async with SessionLocal() as session:
+            # endpoint commit qilmagan bo'lsa (xato) qator yo'q: hech narsa yozilmaydi
+            await session.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(
+                    status_code=response.status_code,
+                    content_type=response.media_type,
+                    body=response.body,
+                )
+            )
+            await session.commit()
+    except Exception:
+        logger.exception("Idempotency response for %s not stored", key)
+
+
+class IdempotentRoute(APIRoute):
+    """POST/PUT/PATCH/DELETE endpointlarda Idempotency-Key header'ini qo'llaydi."""
+
+    def __init__(self, path: str, endpoint, **kwargs):
+        if set(kwargs.get("methods") or ()) & MUTATING_METHODS:
+            kwargs["dependencies"] = [
+                Depends(claim_key),
+                *(kwargs.get("dependencies") or []),
+            ]
+        super().__init__(path, endpoint, **kwargs)
+
+    def get_route_handler(self):
+        handler = super().get_route_handler()
+        if not self.methods & MUTATING_METHODS:
+            return handler
+
+        async def idempotent_handler(request: Request) -> Response:
+            key = request.headers.get(HEADER)
+            if key is None:
+                return await handler(request)
+            if not key or len(key) > MAX_KEY_LENGTH:
+                raise HTTPException(status_code=400, detail=f"Invalid {HEADER} header")
+
+            request_hash = await _request_hash(request)
+            async with SessionLocal() as session:
+                row, lost = (
+                    await session.execute(
+                        select(IdempotencyKey, _response_lost()).where(
+                            IdempotencyKey.key == key,
+                            IdempotencyKey.expires_at >= func.now(),
+                        )
+                    )
+                ).first() or (None, False)
+            if row is not None:
+                if row.request_hash != request_hash:
+                    raise HTTPException(
+                        status_code=422,
+                        detail=f"{HEADER} was already used for a different request",
+                    )
+                if lost:
+                    raise _completed_without_response()
+                if row.status_code is None:
+                    raise _in_progress()
+                return _replay(row)
+
+            request.state.idempotency = (key, request_hash)
+            response = await handler(request)
+            await _store(key, response)
+            return response
+
+        return idempotent_handler
+
+
+async def purge_idempotency_keys():
+    """Muddati o'tgan kalitlar va javoblar."""
+    while True:
+        try:
+            async with SessionLocal() as session:
+                await session.execute(
+                    delete(IdempotencyKey).where(IdempotencyKey.expires_at < func.now())
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning("Idempotency key purge failed: %s", e)
+
+        await asyncio.sleep(settings.IDEMPOTENCY_PURGE_MINUTES * 60)
@@ -0,0 +1,210 @@
+"""
+Rasm variantlari (taom rasmlari, avatarlar).
+
+Yuklangan asl fayl o'zgarmaydi. Fon task'i ``widths`` hali NULL bo'lgan Media
+qatorlarini olib, process pool'da ``IMAGE_WIDTHS`` bo'yicha kichraytirilgan
+``<nom>_w<N>.webp``/``.jpg`` fayllarni va to'liq o'lchamdagi ``<nom>.webp`` ni
+yozadi (app.static Accept: image/webp bo'lsa shuni beradi). Natijada
+``Media.widths`` to'ldiriladi va variant URL'lari MenuItemRead.img'da chiqadi.
+
+Pillow o'rnatilmagan bo'lsa (``pip install .[images]``) pipeline ishlamaydi,
+faqat asl rasm beriladi.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import timedelta
+
+from sqlalchemy import func, or_, select, update
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Media
+from app.uploads import UPLOAD_DIR, UPLOAD_URL, new_uploads
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # ixtiyoriy: pip install .[images]
+    Image = ImageOps = None
+
+
+logger = logging.getLogger(__name__)
+
+RASTER_EXTS = {".jpg", ".jpeg", ".png", ".gif", ".webp"}
+WEBP_QUALITY = 80
+JPEG_QUALITY = 82
+
+
+def _save(image, dest: str, fmt: str, **params):
+    # yarim yozilgan fayl static'dan berilib qolmasin
+    tmp = f"{dest}.tmp"
+    image.save(tmp, fmt, **params)
+    os.replace(tmp, dest)
+
+
+def _flatten(image):
+    """JPEG uchun: shaffof fonni oq bilan to'ldiradi."""
+    if image.mode != "RGBA":
+        return image
+    background = Image.new("RGB", image.size, "white")
+    background.paste(image, mask=image.getchannel("A"))
+    return background
+
+
+def render_variants(path: str, widths: list[int]) -> list[int]:
+    """Worker process ichida: variant fayllarini yozadi, yozilgan kengliklarni
+    qaytaradi (asl rasmdan kattalari kattalashtirilmaydi)."""
+    with Image.open(path) as source:
+        image = ImageOps.exif_transpose(source)
+        has_alpha = "A" in image.getbands() or "transparency" in image.info
+        image = image.convert("RGBA" if has_alpha else "RGB")
+
+    if not path.lower().endswith(".webp"):
+        _save(image, f"{os.path.splitext(path)[0]}.webp", "WEBP", quality=WEBP_QUALITY)
+
+    done = []
+    for width in sorted(set(widths)):
+        if width >= image.width:
+            continue
+        height = max(1, round(image.height * width / image.width))
+        resized = image.resize((width, height), Image.Resampling.LANCZOS)
+        _save(
+            resized,
+            Media.variant_path(path, width, "webp"),
+            "WEBP",
+            quality=WEBP_QUALITY,
+        )
+        _save(
+            _flatten(resized),
+            Media.variant_path(path, width, "jpg"),
+            "JPEG",
+            quality=JPEG_QUALITY,
+            optimize=True,
+            progressive=True,
+        )
+        done.append(width)
+    return done
+
+
+_pool: ProcessPoolExecutor | None = None
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: event loop va DB ulanishlari bor processni fork qilmaymiz
+        _pool = ProcessPoolExecutor(
+            max_workers=settings.IMAGE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def shutdown_image_pool():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def _local_path(media: Media) -> str | None:
+    if not media.url.startswith(f"{UPLOAD_URL}/"):
+        return None
+    path = os.path.join(UPLOAD_DIR, os.path.basename(media.url))
+    if os.path.splitext(path)[1].lower() not in RASTER_EXTS:
+        return None
+    return path if os.path.exists(path) else None
+
+
+async def _widths_for(media: Media) -> list[int]:
+    path = _local_path(media)
+    if path is None:
+        return []
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(
+            _get_pool(), render_variants, path, settings.IMAGE_WIDTHS
+        )
+    except BrokenProcessPool:
+        # fayl emas, worker aybdor: qator NULL qoladi, keyingi safar qayta
+        shutdown_image_pool()
+        raise
+    except Exception:
+        # buzuq fayl qayta-qayta urinilmasin: variantsiz deb belgilanadi
+        logger.exception("Image variants failed for media %s", media.id)
+        return []
+
+
+async def _claim() -> list[Media]:
+    """Ishlanmagan qatorlarni "ishlanmoqda" deb belgilaydi va darhol commit
+    qiladi: render paytida lock ham, ulanish ham ushlanmaydi."""
+    stale = func.now() - timedelta(seconds=settings.IMAGE_CLAIM_SECONDS)
+    # bir nechta worker bo'lsa bir qatorni ikki marta olmaydi
+    pending = (
+        select(Media.id)
+        .where(
+            Media.widths.is_(None),
+            or_(Media.processing_at.is_(None), Media.processing_at < stale),
+        )
+        .order_by(Media.id)
+        .limit(settings.IMAGE_BATCH_SIZE)
+        .with_for_update(skip_locked=True)
+    )
+    async with SessionLocal() as session:
+        rows = (
+            await session.scalars(
+                update(Media)
+                .where(Media.id.in_(pending))
+                .values(processing_at=func.now())
+                .returning(Media)
+                .execution_options(synchronize_session=False)
+            )
+        ).all()
+        await session.commit()
+    return list(rows)
+
+
+async def process_pending() -> int:
+    """Bir batch ishlanmagan Media'ni ishlaydi, nechtasi olinganini qaytaradi."""
+    rows = await _claim()
+    if not rows:
+        return 0
+
+    results = await asyncio.gather(
+        *(_widths_for(media) for media in rows), return_exceptions=True
+    )
+
+    # qisqa ikkinchi tranzaksiya; ORM orqali, menyu snapshot'i yangilansin
+    async with SessionLocal() as session:
+        for media, widths in zip(rows, results):
+            session.add(media)
+            media.processing_at = None
+            if not isinstance(widths, BaseException):
+                media.widths = widths
+        await session.commit()
+
+    for error in results:
+        if isinstance(error, BaseException):
+            raise error
+    return len(rows)
+
+
+async def generate_variants():
+    if Image is None:
+        logger.warning("Pillow is not installed, image variants are disabled")
+        return
+    while True:
+        try:
+            while await process_pending() == settings.IMAGE_BATCH_SIZE:
+                pass
+        except Exception:
+            logger.exception("Image variant pipeline failed")
+        try:
+            await asyncio.wait_for(new_uploads.wait(), settings.IMAGE_SCAN_SECONDS)
+        except asyncio.TimeoutError:
+            pass
+        new_uploads.clear()
@@ -0,0 +1,84 @@
+import asyncio
+import logging
+
+import asyncpg
+
+from app.config import settings
+from app.kitchen import KITCHEN_CHANNEL, kitchen_broker, on_kitchen_notify
+from app.menu_snapshot import MENU_CHANNEL, menu_snapshot, on_menu_notify
+from app.table_status import (
+    TABLE_CHANNEL,
+    on_table_notify,
+    table_broker,
+    tables_snapshot,
+)
+from app.token_cache import (
+    REVOCATION_CHANNEL,
+    load_revocations,
+    on_revocation_notify,
+    revocation_cache,
+)
+from app.user_cache import USER_CHANNEL, on_user_notify, user_cache
+
+
+logger = logging.getLogger(__name__)
+
+PRUNE_INTERVAL = 60
+
+
+def _set_ready(ready: bool):
+    revocation_cache.ready = ready
+    user_cache.ready = ready
+    menu_snapshot.ready = ready
+    tables_snapshot.ready = ready
+
+
+async def listen_invalidations():
+    """Jarayon ichidagi cache'larni boshqa workerlardagi o'zgarishlar bilan
+    NOTIFY orqali sinxron ushlaydi. Ulanish uzilsa cache'lar o'chadi va
+    so'rovlar bazadan o'qiladi."""
+    if settings.DB_PGBOUNCER:
+        # transaction pooling LISTEN'ni qo'llamaydi: har doim bazadan tekshiramiz
+        return
+
+    while True:
+        conn = None
+        try:
+            conn = await asyncpg.connect(
+                user=settings.DB_USER,
+                password=settings.DB_PASSWORD,
+                host=settings.DB_HOST,
+                port=settings.DB_PORT,
+                database=settings.DB_NAME,
+            )
+            lost = asyncio.Event()
+            conn.add_termination_listener(lambda c: lost.set())
+            await conn.add_listener(REVOCATION_CHANNEL, on_revocation_notify)
+            await conn.add_listener(USER_CHANNEL, on_user_notify)
+            await conn.add_listener(MENU_CHANNEL, on_menu_notify)
+            await conn.add_listener(KITCHEN_CHANNEL, on_kitchen_notify)
+            await conn.add_listener(TABLE_CHANNEL, on_table_notify)
+
+            # LISTEN o'rnatilgandan keyin yuklaymiz, oradagi o'zgarish yo'qolmasin
+            user_cache.clear()
+            menu_snapshot.invalidate()
+            tables_snapshot.invalidate()
+            # uzilish paytidagi eventlar yo'qolgan: ekranlar qayta snapshot oladi
+            kitchen_broker.reset()
+            table_broker.reset()
+            await load_revocations()
+            _set_ready(True)
+
+            while not lost.is_set():
+                try:
+                    await asyncio.wait_for(lost.wait(), timeout=PRUNE_INTERVAL)
+                except asyncio.TimeoutError:
+                    revocation_cache.prune()
+        except Exception as e:
+            logger.warning("Invalidation listener disconnected: %s", e)
+        finally:
+            _set_ready(False)
+            if conn is not None and not conn.is_closed():
+                await conn.close()
+
+        await asyncio.sleep(5)
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import logging
+from datetime import datetime
+
+from sqlalchemy import event, select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.broker import EventBroker
+from app.database import SessionLocal
+from app.models import MenuItem, OrderItem
+
+
+logger = logging.getLogger(__name__)
+
+KITCHEN_CHANNEL = "order_item_changed"
+# oshxonada hali bajarilayotgan qatorlar (snapshot shu statuslardan olinadi)
+KITCHEN_STATUSES = ("sent", "ready")
+
+
+def order_item_event(item, station: str) -> dict:
+    """OrderItem (yoki RETURNING qatori) -> oshxona ekrani uchun event."""
+
+    def _ts(value: datetime | None):
+        return value.isoformat() if value else None
+
+    return {
+        "id": item.id,
+        "order_id": item.order_id,
+        "menu_item_id": item.menu_item_id,
+        "variant_id": item.variant_id,
+        "qty": item.qty,
+        "note": item.note,
+        "status": item.status,
+        "station": station,
+        "sent_at": _ts(item.sent_at),
+        "ready_at": _ts(item.ready_at),
+        "served_at": _ts(item.served_at),
+    }
+
+
+def order_item_ref(item) -> str:
+    """NOTIFY payload'i: faqat kalitlar. Izoh (note) kabi uzun maydonlar
+    8000 baytlik chegaraga yetmasin - to'liq qatorni tinglovchi o'qiydi."""
+    return json.dumps(
+        {"id": item.id, "order_id": item.order_id, "status": item.status},
+        separators=(",", ":"),
+    )
+
+
+async def notify_order_items(session: AsyncSession, items: list[OrderItem]):
+    """Bulk INSERT/UPDATE mapper event'larni chaqirmaydi: hammasi uchun bitta
+    so'rovda NOTIFY yuboriladi (tinglovchilarga commit'dan keyin yetadi)."""
+    if not items:
+        return
+    await session.execute(
+        text("SELECT pg_notify(:channel, p) FROM unnest(CAST(:payloads AS text[])) p"),
+        {"channel": KITCHEN_CHANNEL, "payloads": [order_item_ref(i) for i in items]},
+    )
+
+
+kitchen_broker = EventBroker()
+
+
+class KitchenFeed:
+    """NOTIFY'dan kelgan id'lar bo'yicha qatorlarni bazadan o'qib stantsiya
+    ekranlariga tarqatadi. Bitta fon task'i navbatni ketma-ket bo'shatadi:
+    eventlar NOTIFY tartibida, bir paketdagi id'lar bitta SELECT bilan."""
+
+    def __init__(self, broker: EventBroker):
+        self._broker = broker
+        self._queue: asyncio.Queue[int] = asyncio.Queue()
+        self._task: asyncio.Task | None = None
+
+    def push(self, item_id: int):
+        self._queue.put_nowait(item_id)
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def _run(self):
+        while True:
+            ids = [await self._queue.get()]
+            while not self._queue.empty():
+                ids.append(self._queue.get_nowait())
+            try:
+                async with SessionLocal() as session:
+                    res = await session.execute(
+                        select(OrderItem, MenuItem.station)
+                        .join(MenuItem, MenuItem.id == OrderItem.menu_item_id)
+                        .where(OrderItem.id.in_(set(ids)))
+                    )
+                    found = {item.id: (item, station) for item, station in res}
+            except Exception as e:
+                # eventlar yo'qoldi: ekranlar qayta snapshot oladi
+                logger.warning("Kitchen feed failed: %s", e)
+                self._broker.reset()
+                continue
+            # bir qator bir necha marta o'zgargan bo'lsa oxirgi holati bir marta
+            for item_id in dict.fromkeys(ids):
+                if item_id in found:
+                    item, station = found[item_id]
+                    self._broker.publish(
+                        station, json.dumps(order_item_event(item, station))
+                    )
+
+
+kitchen_feed = KitchenFeed(kitchen_broker)
+
+
+def on_kitchen_notify(connection, pid, channel, payload: str):
+    kitchen_feed.push(json.loads(payload)["id"])
+
+
+async def station_snapshot(session: AsyncSession, station: str) -> list[dict]:
+    stmt = (
+        select(OrderItem)
+        .join(MenuItem, MenuItem.id == OrderItem.menu_item_id)
+        .where(MenuItem.station == station, OrderItem.status.in_(KITCHEN_STATUSES))
+        .order_by(OrderItem.sent_at, OrderItem.id)
+    )
+    items = (await session.execute(stmt)).scalars().all()
+    return [order_item_event(item, station) for item in items]
+
+
+@event.listens_for(OrderItem, "after_insert")
+@event.listens_for(OrderItem, "after_update")
+def _notify_order_item_changed(mapper, connection, target: OrderItem):
+    # admin panel va ORM orqali bitta-bitta o'zgarishlar
+    connection.execute(select(func.pg_notify(KITCHEN_CHANNEL, order_item_ref(target))))
@@ -1,5 +1,7 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
 
 from app.routers import (
     table_router,
@@ -7,12 +9,42 @@ from app.routers import (
     menu_router,
     order_router,
     user_router,
+    metrics_router,
+    kitchen_router,
+    reports_router,
 )
 
 # from app.middleware.dbmiddleware import DBSessionMiddleware
 from app.admin.settings import admin
+from app.audit import audit, maintain_partitions
+from app.compression import CompressionMiddleware
+from app.idempotency import purge_idempotency_keys
+from app.images import generate_variants, shutdown_image_pool
+from app.invalidation import listen_invalidations
+from app.static import UploadFiles
+from app.token_cache import purge_revocations
+from app.uploads import UPLOAD_DIR
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = [
+        asyncio.create_task(listen_invalidations()),
+        asyncio.create_task(purge_revocations()),
+        asyncio.create_task(purge_idempotency_keys()),
+        asyncio.create_task(maintain_partitions()),
+        asyncio.create_task(generate_variants()),
+    ]
+    audit.start()
+    yield
+    for task in tasks:
+        task.cancel()
+    shutdown_image_pool()
+    # navbatdagi audit eventlar yo'qolmasin
+    await audit.stop()
+
 
-app = FastAPI(title="ZIYOFAT-DAY")
+app = FastAPI(title="ZIYOFAT-DAY", lifespan=lifespan)
 
 
 app.include_router(login_router)
@@ -20,10 +52,14 @@ app.include_router(user_router)
 app.include_router(table_router)
 app.include_router(menu_router)
 app.include_router(order_router)
+app.include_router(metrics_router)
+app.include_router(kitchen_router)
+app.include_router(reports_router)
 
 # app.add_middleware(DBSessionMiddleware)
+app.add_middleware(CompressionMiddleware)
 
 admin.mount_to(app=app)
 
 
-app.mount("/static/uploads", StaticFiles(directory="media_uploads"), name="uploads")
+app.mount("/static/uploads", UploadFiles(directory=UPLOAD_DIR), name="uploads")
@@ -0,0 +1,81 @@
+from sqlalchemy import event, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.models import Media, MenuCategory, MenuItem, MenuItemVariant
+from app.schemas import MenuFullRead, MenuCategoryTree, MenuItemRead
+from app.snapshot import Snapshot, SnapshotCache
+
+
+MENU_CHANNEL = "menu_changed"
+
+# variantlar bitta qo'shimcha SELECT ... IN (...) bilan, faqat faollari
+ACTIVE_VARIANTS = selectinload(
+    MenuItem.variants.and_(MenuItemVariant.is_active == True)  # noqa: E712
+)
+# rasm va uning o'lcham variantlari (MenuItemRead.img)
+ITEM_IMAGE = selectinload(MenuItem.img)
+
+
+async def build_menu_snapshot(session: AsyncSession) -> Snapshot:
+    categories = (
+        (await session.execute(select(MenuCategory).order_by(MenuCategory.sort_order)))
+        .scalars()
+        .all()
+    )
+    items = (
+        (
+            await session.execute(
+                select(MenuItem)
+                .where(MenuItem.is_active == True)  # noqa: E712
+                .order_by(MenuItem.id)
+                .options(ACTIVE_VARIANTS, ITEM_IMAGE)
+            )
+        )
+        .scalars()
+        .all()
+    )
+
+    by_category: dict[int | None, list[MenuItemRead]] = {}
+    for item in items:
+        by_category.setdefault(item.category_id, []).append(
+            MenuItemRead.model_validate(item)
+        )
+
+    menu = MenuFullRead(
+        categories=[
+            MenuCategoryTree(
+                id=c.id,
+                name=c.name,
+                sort_order=c.sort_order,
+                items=by_category.get(c.id, []),
+            )
+            for c in categories
+        ],
+        uncategorized=by_category.get(None, []),
+    )
+    return Snapshot(menu.model_dump_json().encode())
+
+
+menu_snapshot = SnapshotCache(build_menu_snapshot)
+
+
+def on_menu_notify(connection, pid, channel, payload: str):
+    menu_snapshot.invalidate()
+
+
+@event.listens_for(MenuCategory, "after_insert")
+@event.listens_for(MenuCategory, "after_update")
+@event.listens_for(MenuCategory, "after_delete")
+@event.listens_for(MenuItem, "after_insert")
+@event.listens_for(MenuItem, "after_update")
+@event.listens_for(MenuItem, "after_delete")
+@event.listens_for(MenuItemVariant, "after_insert")
+@event.listens_for(MenuItemVariant, "after_update")
+@event.listens_for(MenuItemVariant, "after_delete")
+@event.listens_for(Media, "after_update")
+def _notify_menu_changed(mapper, connection, target):
+    # MenuCategoryView, MenuItemView, MenuVariantView commit'lari shu yerdan o'tadi;
+    # Media: app.images rasm variantlarini yozganda
+    menu_snapshot.invalidate()
+    connection.execute(select(func.pg_notify(MENU_CHANNEL, mapper.class_.__name__)))
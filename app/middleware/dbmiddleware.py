@@ -7,10 +7,10 @@ class DBSessionMiddleware(BaseHTTPMiddleware):
         request.state.session = SessionLocal()
         try:
             response = await call_next(request)
-            request.state.session.commit()
+            await request.state.session.commit()
             return response
         except:
-            request.state.session.rollback()
+            await request.state.session.rollback()
             raise
         finally:
-            request.state.session.close()
+            await request.state.session.close()
@@ -1,3 +1,4 @@
+import os
 from datetime import datetime
 from fastapi import Request
 from sqlalchemy import (
@@ -8,9 +9,12 @@ from sqlalchemy import (
     ForeignKey,
     Numeric,
     DateTime,
-    JSON,
+    Index,
+    LargeBinary,
     func,
+    text,
 )
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from app.database import Base
 
@@ -52,6 +56,8 @@ class DiningTable(BaseModel):
     table_no: Mapped[str] = mapped_column(String, unique=True)
     capacity: Mapped[int] = mapped_column(Integer)
     status: Mapped[str] = mapped_column(String, nullable=True, default="free")
+    # har bir status o'zgarishida +1 (floor plan oqimi shu bo'yicha tartiblaydi)
+    version: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
 
     orders = relationship("Order", back_populates="table")
 
@@ -72,7 +78,7 @@ class MenuItem(BaseModel):
     __tablename__ = "menu_item"
 
     category_id: Mapped[int] = mapped_column(
-        ForeignKey("menu_category.id"), nullable=True
+        ForeignKey("menu_category.id"), nullable=True, index=True
     )
     name: Mapped[str] = mapped_column(String)
     img_id: Mapped[int] = mapped_column(
@@ -87,24 +93,40 @@ class MenuItem(BaseModel):
     variants = relationship("MenuItemVariant", back_populates="menu_item")
     img: Mapped["Media"] = relationship("Media", foreign_keys=[img_id])
 
+    __table_args__ = (
+        Index(
+            "ix_menu_item_active_category_id",
+            "category_id",
+            postgresql_where=text("is_active"),
+        ),
+    )
+
 
 class MenuItemVariant(BaseModel):
     __tablename__ = "menu_item_variant"
 
-    menu_item_id: Mapped[int] = mapped_column(ForeignKey("menu_item.id"))
+    menu_item_id: Mapped[int] = mapped_column(ForeignKey("menu_item.id"), index=True)
     name: Mapped[str] = mapped_column(String)
     price_delta: Mapped[float] = mapped_column(Numeric)
     is_active: Mapped[bool] = mapped_column(Boolean, default=True)
 
     menu_item = relationship("MenuItem", back_populates="variants")
 
+    __table_args__ = (
+        Index(
+            "ix_menu_item_variant_active_menu_item_id",
+            "menu_item_id",
+            postgresql_where=text("is_active"),
+        ),
+    )
+
 
 class Order(BaseModel):
     __tablename__ = "orders"
 
-    table_id: Mapped[int] = mapped_column(ForeignKey("dining_table.id"))
-    waiter_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
-    status: Mapped[str] = mapped_column(String)
+    table_id: Mapped[int] = mapped_column(ForeignKey("dining_table.id"), index=True)
+    waiter_id: Mapped[int] = mapped_column(ForeignKey("users.id"), index=True)
+    status: Mapped[str] = mapped_column(String, index=True)
     opened_at: Mapped[datetime] = mapped_column(DateTime, default=func.now())
     submitted_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
     closed_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
@@ -115,19 +137,29 @@ class Order(BaseModel):
     items = relationship("OrderItem", back_populates="order")
     payments = relationship("Payment", back_populates="order")
 
+    __table_args__ = (
+        # /orders/ keyset pagination
+        Index("ix_orders_opened_at_id", "opened_at", "id"),
+        Index(
+            "ix_orders_open_table_id",
+            "table_id",
+            postgresql_where=text("status IN ('open', 'submitted')"),
+        ),
+    )
+
 
 class OrderItem(BaseModel):
     __tablename__ = "order_item"
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
-    order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"))
+    order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"), index=True)
     menu_item_id: Mapped[int] = mapped_column(ForeignKey("menu_item.id"))
     variant_id: Mapped[int] = mapped_column(
         ForeignKey("menu_item_variant.id"), nullable=True
     )
     qty: Mapped[int] = mapped_column(Integer)
     unit_price: Mapped[float] = mapped_column(Numeric)
-    status: Mapped[str] = mapped_column(String)
+    status: Mapped[str] = mapped_column(String, index=True)
     note: Mapped[str] = mapped_column(String, nullable=True)
 
     sent_at: Mapped[datetime] = mapped_column(DateTime, nullable=True)
@@ -150,7 +182,7 @@ class OrderItem(BaseModel):
 class Payment(BaseModel):
     __tablename__ = "payment"
 
-    order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"))
+    order_id: Mapped[int] = mapped_column(ForeignKey("orders.id"), index=True)
     cashier_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=True)
     method: Mapped[str] = mapped_column(String)
     amount: Mapped[float] = mapped_column(Numeric)
@@ -163,11 +195,36 @@ class Payment(BaseModel):
 class AuditLog(BaseModel):
     __tablename__ = "audit_log"
 
-    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"))
+    # partition kaliti primary key'da bo'lishi shart: (id, created_at)
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), primary_key=True, default=func.now()
+    )
+
+    # autentifikatsiyasiz endpointlar (stollar, oshxona) uchun bo'sh
+    user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=True)
     entity: Mapped[str] = mapped_column(String)
     entity_id: Mapped[int] = mapped_column(BigInteger)
     action: Mapped[str] = mapped_column(String)
-    meta: Mapped[dict] = mapped_column(JSON)
+    meta: Mapped[dict] = mapped_column(JSONB)
+
+    # oylik partitionlar created_at bo'yicha (app.audit.maintain_partitions)
+    __table_args__ = (
+        Index(
+            "ix_audit_log_entity_entity_id_created_at",
+            "entity",
+            "entity_id",
+            "created_at",
+        ),
+        Index("ix_audit_log_user_id_created_at", "user_id", "created_at"),
+        Index(
+            "ix_audit_log_meta",
+            "meta",
+            postgresql_using="gin",
+            postgresql_ops={"meta": "jsonb_path_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
 
 class Media(Base):
@@ -175,9 +232,81 @@ class Media(Base):
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     url: Mapped[str] = mapped_column(String)
+    # fayl tarkibi bo'yicha: bir xil rasm qayta yozilmaydi (app.uploads)
+    sha256: Mapped[str] = mapped_column(String(64), unique=True, nullable=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=True)
+    # app.images yaratgan kenglik variantlari; NULL - hali ishlanmagan
+    widths: Mapped[list[int]] = mapped_column(JSONB, nullable=True)
+    # app.images worker qatorni olgan vaqt (render paytida lock ushlanmaydi)
+    processing_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+    @staticmethod
+    def variant_path(path: str, width: int, ext: str) -> str:
+        """``<nom>.jpg`` -> ``<nom>_w320.webp`` (URL va disk yo'li uchun bir xil)."""
+        return f"{os.path.splitext(path)[0]}_w{width}.{ext}"
+
+    @classmethod
+    def variant_urls(cls, url: str, widths: list[int] | None) -> list[dict]:
+        return [
+            {
+                "width": w,
+                "webp": cls.variant_path(url, w, "webp"),
+                "jpeg": cls.variant_path(url, w, "jpg"),
+            }
+            for w in widths or []
+        ]
+
+    @property
+    def variants(self) -> list[dict]:
+        return self.variant_urls(self.url, self.widths)
 
 
 class TokenBlacklist(Base):
     __tablename__ = "token_blacklist"
 
-    token: Mapped[str] = mapped_column(String, primary_key=True)
+    token_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+
+
+class IdempotencyKey(Base):
+    """Idempotency-Key bilan kelgan so'rov va saqlangan javob (app.idempotency)."""
+
+    __tablename__ = "idempotency_key"
+
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+    # method + path + query + body sha256: kalit boshqa so'rovga ishlatilmasin
+    request_hash: Mapped[str] = mapped_column(String(64))
+    # NULL - mutatsiya commit bo'lgan, javob hali yozilmagan
+    status_code: Mapped[int] = mapped_column(Integer, nullable=True)
+    content_type: Mapped[str] = mapped_column(String, nullable=True)
+    body: Mapped[bytes] = mapped_column(LargeBinary, nullable=True)
+    expires_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), index=True)
+    # javob IDEMPOTENCY_LEASE_SECONDS ichida yozilmasa u yo'qolgan hisoblanadi
+    claimed_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now()
+    )
+
+
+class SalesItemHourly(Base):
+    """Yopilgan buyurtmalar qatorlari: soat x stantsiya x taom bo'yicha jami."""
+
+    __tablename__ = "sales_item_hourly"
+
+    hour: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    station: Mapped[str] = mapped_column(String, primary_key=True)
+    menu_item_id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
+    qty: Mapped[int] = mapped_column(Integer, default=0)
+    revenue: Mapped[float] = mapped_column(Numeric, default=0)
+
+
+class SalesPaymentHourly(Base):
+    """To'lovlar: soat x to'lov turi bo'yicha jami."""
+
+    __tablename__ = "sales_payment_hourly"
+
+    hour: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    method: Mapped[str] = mapped_column(String, primary_key=True)
+    amount: Mapped[float] = mapped_column(Numeric, default=0)
+    payments: Mapped[int] = mapped_column(Integer, default=0)
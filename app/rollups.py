@@ -0,0 +1,293 @@
+"""
+Soatlik savdo rollup jadvallari.
+
+Buyurtma yopilganda uning qatorlari ``sales_item_hourly`` ga, to'lov
+yozilganda ``sales_payment_hourly`` ga shu tranzaksiya ichida qo'shiladi.
+Yopilgan buyurtma qatorlarini tahrirlash ham rollup'ni to'g'rilaydi (admin
+panel orqali o'zgarishlar ham mapper event'lardan o'tadi).
+Hisobotlar faqat shu jadvallarni o'qiydi.
+
+Tarixni qayta hisoblash:
+
+    python -m app.rollups --from 2025-01-01 --to 2026-01-01
+"""
+
+import argparse
+import asyncio
+from datetime import date, datetime, time, timedelta
+
+from sqlalchemy import Select, delete, event, func, inspect, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import SessionLocal, engine
+from app.models import (
+    MenuItem,
+    Order,
+    OrderItem,
+    Payment,
+    SalesItemHourly,
+    SalesPaymentHourly,
+)
+
+
+# date_trunc parametrli bo'lgani uchun GROUP BY ifoda emas, pozitsiya bilan
+def _item_rows(*where, sign: int = 1) -> Select:
+    return (
+        select(
+            func.date_trunc("hour", Order.closed_at),
+            MenuItem.station,
+            OrderItem.menu_item_id,
+            func.sum(OrderItem.qty) * sign,
+            func.sum(OrderItem.qty * OrderItem.unit_price) * sign,
+        )
+        .join(Order, Order.id == OrderItem.order_id)
+        .join(MenuItem, MenuItem.id == OrderItem.menu_item_id)
+        .where(*where)
+        .group_by(text("1, 2, 3"))
+    )
+
+
+def _payment_rows(*where, sign: int = 1) -> Select:
+    return (
+        select(
+            func.date_trunc("hour", Payment.paid_at),
+            Payment.method,
+            func.sum(Payment.amount) * sign,
+            func.count() * sign,
+        )
+        .where(*where)
+        .group_by(text("1, 2"))
+    )
+
+
+def upsert_items(rows: Select):
+    stmt = pg_insert(SalesItemHourly).from_select(
+        ["hour", "station", "menu_item_id", "qty", "revenue"], rows
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=["hour", "station", "menu_item_id"],
+        set_={
+            "qty": SalesItemHourly.qty + stmt.excluded.qty,
+            "revenue": SalesItemHourly.revenue + stmt.excluded.revenue,
+        },
+    )
+
+
+def upsert_payments(rows: Select):
+    stmt = pg_insert(SalesPaymentHourly).from_select(
+        ["hour", "method", "amount", "payments"], rows
+    )
+    return stmt.on_conflict_do_update(
+        index_elements=["hour", "method"],
+        set_={
+            "amount": SalesPaymentHourly.amount + stmt.excluded.amount,
+            "payments": SalesPaymentHourly.payments + stmt.excluded.payments,
+        },
+    )
+
+
+def _status_change(target: Order) -> tuple[str | None, str | None] | None:
+    history = inspect(target).attrs.status.history
+    if not history.has_changes():
+        return None
+    old = history.deleted[0] if history.deleted else None
+    return old, target.status
+
+
+@event.listens_for(Order, "before_update")
+def _order_reopened(mapper, connection, target: Order):
+    change = _status_change(target)
+    if change and change[1] == "closed" and target.closed_at is None:
+        # admin panel closed_at'siz yopishi mumkin: soat NULL bo'lmasin
+        target.closed_at = datetime.now()
+    if change and change[0] == "closed" and change[1] != "closed":
+        # bazada hali eski closed_at turibdi: aynan qo'shilgan soatdan ayiramiz
+        connection.execute(
+            upsert_items(
+                _item_rows(
+                    OrderItem.order_id == target.id,
+                    Order.closed_at.is_not(None),
+                    sign=-1,
+                )
+            )
+        )
+
+
+@event.listens_for(Order, "after_update")
+def _order_closed(mapper, connection, target: Order):
+    change = _status_change(target)
+    if change and change[0] != "closed" and change[1] == "closed":
+        connection.execute(upsert_items(_item_rows(OrderItem.order_id == target.id)))
+
+
+def _closed_item_rows(target: OrderItem, sign: int = 1) -> Select:
+    # ochiq buyurtma qatorlari rollup'da yo'q: ular yopilganda qo'shiladi
+    return _item_rows(OrderItem.id == target.id, Order.status == "closed", sign=sign)
+
+
+def _item_changed(target: OrderItem) -> bool:
+    attrs = inspect(target).attrs
+    return any(
+        attrs[name].history.has_changes()
+        for name in ("order_id", "menu_item_id", "qty", "unit_price")
+    )
+
+
+@event.listens_for(OrderItem, "after_insert")
+def _item_added(mapper, connection, target: OrderItem):
+    connection.execute(upsert_items(_closed_item_rows(target)))
+
+
+@event.listens_for(OrderItem, "before_update")
+def _item_before_update(mapper, connection, target: OrderItem):
+    if _item_changed(target):
+        connection.execute(upsert_items(_closed_item_rows(target, sign=-1)))
+
+
+@event.listens_for(OrderItem, "after_update")
+def _item_after_update(mapper, connection, target: OrderItem):
+    if _item_changed(target):
+        connection.execute(upsert_items(_closed_item_rows(target)))
+
+
+@event.listens_for(OrderItem, "before_delete")
+def _item_deleted(mapper, connection, target: OrderItem):
+    connection.execute(upsert_items(_closed_item_rows(target, sign=-1)))
+
+
+def _payment_changed(target: Payment) -> bool:
+    attrs = inspect(target).attrs
+    return any(
+        attrs[name].history.has_changes() for name in ("amount", "method", "paid_at")
+    )
+
+
+@event.listens_for(Payment, "after_insert")
+def _payment_added(mapper, connection, target: Payment):
+    connection.execute(upsert_payments(_payment_rows(Payment.id == target.id)))
+
+
+@event.listens_for(Payment, "before_update")
+def _payment_before_update(mapper, connection, target: Payment):
+    if _payment_changed(target):
+        connection.execute(
+            upsert_payments(_payment_rows(Payment.id == target.id, sign=-1))
+        )
+
+
+@event.listens_for(Payment, "after_update")
+def _payment_after_update(mapper, connection, target: Payment):
+    if _payment_changed(target):
+        connection.execute(upsert_payments(_payment_rows(Payment.id == target.id)))
+
+
+@event.listens_for(Payment, "before_delete")
+def _payment_deleted(mapper, connection, target: Payment):
+    connection.execute(upsert_payments(_payment_rows(Payment.id == target.id, sign=-1)))
+
+
+async def sales_report(
+    session: AsyncSession,
+    grain: str,
+    date_from: datetime,
+    date_to: datetime,
+    station: str | None = None,
+    menu_item_id: int | None = None,
+):
+    period = func.date_trunc(grain, SalesItemHourly.hour)
+    stmt = select(
+        period.label("period"),
+        SalesItemHourly.station,
+        SalesItemHourly.menu_item_id,
+        func.sum(SalesItemHourly.qty).label("qty"),
+        func.sum(SalesItemHourly.revenue).label("revenue"),
+    ).where(SalesItemHourly.hour >= date_from, SalesItemHourly.hour < date_to)
+
+    if station:
+        stmt = stmt.where(SalesItemHourly.station == station)
+    if menu_item_id is not None:
+        stmt = stmt.where(SalesItemHourly.menu_item_id == menu_item_id)
+
+    stmt = stmt.group_by(text("1, 2, 3")).order_by(text("1, 2, 3"))
+    return (await session.execute(stmt)).mappings().all()
+
+
+async def payments_report(
+    session: AsyncSession,
+    grain: str,
+    date_from: datetime,
+    date_to: datetime,
+    method: str | None = None,
+):
+    period = func.date_trunc(grain, SalesPaymentHourly.hour)
+    stmt = select(
+        period.label("period"),
+        SalesPaymentHourly.method,
+        func.sum(SalesPaymentHourly.amount).label("amount"),
+        func.sum(SalesPaymentHourly.payments).label("payments"),
+    ).where(SalesPaymentHourly.hour >= date_from, SalesPaymentHourly.hour < date_to)
+
+    if method:
+        stmt = stmt.where(SalesPaymentHourly.method == method)
+
+    stmt = stmt.group_by(text("1, 2")).order_by(text("1, 2"))
+    return (await session.execute(stmt)).mappings().all()
+
+
+async def backfill(session: AsyncSession, date_from: datetime, date_to: datetime):
+    """[date_from, date_to) rollup'larini manba jadvallardan qayta quradi."""
+    await session.execute(
+        delete(SalesItemHourly).where(
+            SalesItemHourly.hour >= date_from, SalesItemHourly.hour < date_to
+        )
+    )
+    await session.execute(
+        delete(SalesPaymentHourly).where(
+            SalesPaymentHourly.hour >= date_from, SalesPaymentHourly.hour < date_to
+        )
+    )
+    await session.execute(
+        upsert_items(
+            _item_rows(
+                Order.status == "closed",
+                Order.closed_at >= date_from,
+                Order.closed_at < date_to,
+            )
+        )
+    )
+    await session.execute(
+        upsert_payments(
+            _payment_rows(Payment.paid_at >= date_from, Payment.paid_at < date_to)
+        )
+    )
+
+
+async def _main(date_from: date, date_to: date):
+    start = datetime.combine(date_from, time())
+    end = datetime.combine(date_to, time())
+    async with SessionLocal() as session:
+        # kunma-kun: har bir tranzaksiya qisqa, jadval uzoq bloklanmaydi
+        day = start
+        while day < end:
+            next_day = min(day + timedelta(days=1), end)
+            await backfill(session, day, next_day)
+            await session.commit()
+            print(f"{day:%Y-%m-%d} ok")
+            day = next_day
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Savdo rollup'larini qayta hisoblash")
+    parser.add_argument(
+        "--from", dest="date_from", type=date.fromisoformat, required=True
+    )
+    parser.add_argument(
+        "--to",
+        dest="date_to",
+        type=date.fromisoformat,
+        default=date.today() + timedelta(days=1),
+    )
+    args = parser.parse_args()
+    asyncio.run(_main(args.date_from, args.date_to))
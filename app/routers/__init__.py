@@ -3,5 +3,17 @@ from .auth.login import router as login_router
 from .menu import router as menu_router
 from .order import router as order_router
 from .user import router as user_router
+from .metrics import router as metrics_router
+from .kitchen import router as kitchen_router
+from .reports import router as reports_router
 
-__all__ = [table_router, login_router, menu_router, order_router]
+__all__ = [
+    "table_router",
+    "login_router",
+    "menu_router",
+    "order_router",
+    "user_router",
+    "metrics_router",
+    "kitchen_router",
+    "reports_router",
+]
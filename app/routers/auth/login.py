@@ -1,12 +1,23 @@
 from datetime import datetime, timezone
 
 from fastapi import APIRouter, HTTPException, Depends, Form, Request
-from sqlalchemy import select
+from sqlalchemy import select, func
 
 from app.database import db_dep
 from app.schemas import RefreshTokenRequest
 from app.models import User, TokenBlacklist
-from app.utils import verify_password, generate_jwt_tokens, decode_jwt_token
+from app.token_cache import (
+    REVOCATION_CHANNEL,
+    notify_payload,
+    revocation_cache,
+    token_exp,
+)
+from app.utils import (
+    verify_password_async,
+    generate_jwt_tokens,
+    decode_jwt_token,
+    hash_token,
+)
 
 
 router = APIRouter(prefix="/auth", tags=["Auth"])
@@ -19,10 +30,10 @@ async def login(
     # email, password ask
     # user topilsa, yangi access va refresh tokenlar generatsiya qilamiz
     stmt = select(User).where(User.username == username)
-    user = db.execute(stmt).scalars().first()
+    user = (await db.execute(stmt)).scalars().first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    if not verify_password(password, user.password_hash):
+    if not await verify_password_async(password, user.password_hash):
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
     access_token, refresh_token = generate_jwt_tokens(user.id)
@@ -67,7 +78,19 @@ async def logout(
 
     token = credentials.credentials  # toza token
 
-    session.add(TokenBlacklist(token=token))
-    session.commit()
+    token_hash, exp = hash_token(token), token_exp(token)
+
+    session.add(
+        TokenBlacklist(
+            token_hash=token_hash,
+            expires_at=datetime.fromtimestamp(exp, tz=timezone.utc),
+        )
+    )
+    # NOTIFY commit bilan birga yetkaziladi: boshqa workerlar cache'ni yangilaydi
+    await session.execute(
+        select(func.pg_notify(REVOCATION_CHANNEL, notify_payload(token_hash, exp)))
+    )
+    await session.commit()
+    revocation_cache.add(token_hash, exp)
 
     return {"detail": "Logout successfully"}
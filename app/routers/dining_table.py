@@ -1,26 +1,78 @@
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, Header, HTTPException, Request
+from sqlalchemy import select, update
 
+from app.audit import audit
+from app.broker import sse_stream
 from app.models import DiningTable
-from app.database import db_dep
+from app.database import SessionLocal, db_dep
+from app.fastjson import json_response, rows
+from app.table_status import (
+    FLOOR,
+    floor_snapshot,
+    notify_table,
+    table_broker,
+    tables_snapshot,
+)
 from app.schemas import TableRead,TableStatusChoise
 
 router = APIRouter(prefix="/tables", tags=["Tables"])
 
 
-@router.get("/", response_model=list[TableRead])
-async def get_tables(session: db_dep, status: TableStatusChoise | None = None):
-    stmt = select(DiningTable)
-    if status:
-        stmt = stmt.where(DiningTable.status == status)
-    res = session.execute(stmt)
-    return res.scalars().all()
+@router.get("/", response_model=list[TableRead], responses={304: {}})
+async def get_tables(
+    session: db_dep, request: Request, status: TableStatusChoise | None = None
+):
+    """
+    Stollar ro'yxati. Filtersiz so'rov tayyor (siqilgan) snapshot'dan,
+    ETag bilan; If-None-Match mos kelsa 304.
+    """
+    if status is None:
+        snapshot = await tables_snapshot.get(session)
+        return await snapshot.response(request)
+
+    # tez yo'l (app.fastjson): ORM obyekt va Pydantic'siz, TableRead ustunlari
+    stmt = select(
+        DiningTable.id,
+        DiningTable.table_no,
+        DiningTable.capacity,
+        DiningTable.status,
+        DiningTable.version,
+    )
+    stmt = stmt.where(DiningTable.status == status).order_by(DiningTable.id)
+    return json_response(rows(await session.execute(stmt)))
+
+
+@router.get("/stream/")
+async def tables_stream(
+    request: Request,
+    last_event_id: str | None = None,
+    last_event_id_header: str | None = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Floor plan uchun SSE oqimi.
+    Avval ``snapshot``: [[table_id, status, version], ...], keyin faqat
+    o'zgargan stollar ``table`` eventi: [table_id, status, version].
+    Klient kichikroq version'li deltani e'tiborsiz qoldiradi.
+    """
+
+    async def snapshot():
+        async with SessionLocal() as session:
+            return await floor_snapshot(session)
+
+    return await sse_stream(
+        request,
+        table_broker,
+        FLOOR,
+        last_event_id_header or last_event_id,
+        snapshot,
+        "table",
+    )
 
 
 @router.get("/{table_id}/", response_model=TableRead)
 async def get_table(session: db_dep, table_id: int):
     stmt = select(DiningTable).where(DiningTable.id == table_id)
-    res = session.execute(stmt)
+    res = await session.execute(stmt)
     table = res.scalars().first()
 
     if not table:
@@ -28,50 +80,60 @@ async def get_table(session: db_dep, table_id: int):
     return table
 
 
-@router.post("/{table_id}/reserve/")
-async def reserve_table(session: db_dep, table_id: int):
-    stmt = select(DiningTable).where(DiningTable.id == table_id)
-    res = session.execute(stmt)
-    table = res.scalars().first()
+async def _transition(
+    session, table_id: int, allowed: tuple[str, ...], status: str, conflict: str
+) -> DiningTable:
+    """
+    Bitta UPDATE ... WHERE id AND status IN (...) RETURNING: tekshiruv va
+    o'zgartirish atomik, bir vaqtda kelgan ikki so'rovdan faqat bittasi o'tadi.
+    """
+    stmt = (
+        update(DiningTable)
+        .where(DiningTable.id == table_id, DiningTable.status.in_(allowed))
+        .values(status=status, version=DiningTable.version + 1)
+        .returning(DiningTable)
+    )
+    table = (await session.scalars(stmt)).first()
 
     if not table:
-        raise HTTPException(status_code=404, detail="Table not found")
-    if table.status != "free":
-        raise HTTPException(status_code=400, detail="Table is not free")
-
-    table.status = "reserved"
-    session.commit()
-    session.refresh(table)
+        exists = await session.scalar(
+            select(DiningTable.id).where(DiningTable.id == table_id)
+        )
+        if not exists:
+            raise HTTPException(status_code=404, detail="Table not found")
+        raise HTTPException(status_code=409, detail=conflict)
+
+    # bulk UPDATE mapper event'ni chaqirmaydi: NOTIFY shu yerdan
+    await notify_table(session, table)
+    await session.commit()
+    audit.log(None, "table", table_id, status, {"version": table.version})
     return table
 
 
-@router.post("/{table_id}/occupy/")
-async def occupy_table(session: db_dep, table_id: int):
-    stmt = select(DiningTable).where(DiningTable.id == table_id)
-    res = session.execute(stmt)
-    table = res.scalars().first()
+@router.post("/{table_id}/reserve/", response_model=TableRead)
+async def reserve_table(session: db_dep, table_id: int):
+    return await _transition(
+        session, table_id, ("free",), "reserved", "Table is not free"
+    )
 
-    if not table:
-        raise HTTPException(status_code=404, detail="Table not found")
-    if table.status == "occupied":
-        raise HTTPException(status_code=400, detail="Table is already occupied")
 
-    table.status = "occupied"
-    session.commit()
-    session.refresh(table)
-    return table
+@router.post("/{table_id}/occupy/", response_model=TableRead)
+async def occupy_table(session: db_dep, table_id: int):
+    return await _transition(
+        session,
+        table_id,
+        ("free", "reserved"),
+        "occupied",
+        "Table is already occupied",
+    )
 
 
-@router.post("/{table_id}/release/")
+@router.post("/{table_id}/release/", response_model=TableRead)
 async def release_table(session: db_dep, table_id: int):
-    stmt = select(DiningTable).where(DiningTable.id == table_id)
-    res = session.execute(stmt)
-    table = res.scalars().first()
-
-    if not table:
-        raise HTTPException(status_code=404, detail="Table not found")
-
-    table.status = "free"
-    session.commit()
-    session.refresh(table)
-    return table
+    return await _transition(
+        session,
+        table_id,
+        ("reserved", "occupied"),
+        "free",
+        "Table is already free",
+    )
@@ -0,0 +1,86 @@
+from datetime import datetime
+
+from fastapi import APIRouter, Header, HTTPException, Request
+from sqlalchemy import select, update
+
+from app.audit import audit
+from app.broker import sse_stream
+from app.database import SessionLocal, db_dep
+from app.idempotency import IdempotentRoute
+from app.kitchen import kitchen_broker, notify_order_items, station_snapshot
+from app.models import OrderItem
+from app.schemas.schemas import OrderItemRead
+
+router = APIRouter(prefix="/kitchen", tags=["Kitchen"], route_class=IdempotentRoute)
+
+
+@router.get("/{station}/stream/")
+async def station_stream(
+    request: Request,
+    station: str,
+    last_event_id: str | None = None,
+    last_event_id_header: str | None = Header(None, alias="Last-Event-ID"),
+):
+    """
+    Stantsiya ekrani uchun SSE oqimi.
+    Avval ``snapshot`` (hozir tayyorlanayotgan qatorlar), keyin har bir
+    o'zgarish ``item`` eventi. Qayta ulanishda brauzer Last-Event-ID yuboradi:
+    bufer yetsa faqat o'tkazib yuborilgan eventlar, aks holda yangi snapshot.
+    """
+
+    async def snapshot():
+        async with SessionLocal() as session:
+            return await station_snapshot(session, station)
+
+    return await sse_stream(
+        request,
+        kitchen_broker,
+        station,
+        last_event_id_header or last_event_id,
+        snapshot,
+        "item",
+    )
+
+
+async def _set_item_status(
+    session, item_id: int, allowed: tuple[str, ...], status: str, field: str
+):
+    """
+    Bitta UPDATE ... WHERE id AND status IN (...) RETURNING: served -> ready,
+    bekor qilingan -> ready yoki ikki marta ready bo'lmaydi.
+    """
+    stmt = (
+        update(OrderItem)
+        .where(OrderItem.id == item_id, OrderItem.status.in_(allowed))
+        .values({"status": status, field: datetime.now()})
+        .returning(OrderItem)
+    )
+    item = (await session.scalars(stmt)).first()
+
+    if not item:
+        exists = await session.scalar(
+            select(OrderItem.id).where(OrderItem.id == item_id)
+        )
+        if not exists:
+            raise HTTPException(status_code=404, detail="Order item not found")
+        raise HTTPException(
+            status_code=409, detail=f"Order item cannot be marked {status}"
+        )
+
+    # bulk UPDATE mapper event'ni chaqirmaydi: NOTIFY shu yerdan
+    await notify_order_items(session, [item])
+    await session.commit()
+    audit.log(None, "order_item", item_id, status, {"order_id": item.order_id})
+    return item
+
+
+@router.post("/items/{item_id}/ready/", response_model=OrderItemRead)
+async def item_ready(session: db_dep, item_id: int):
+    return await _set_item_status(session, item_id, ("sent",), "ready", "ready_at")
+
+
+@router.post("/items/{item_id}/served/", response_model=OrderItemRead)
+async def item_served(session: db_dep, item_id: int):
+    return await _set_item_status(
+        session, item_id, ("sent", "ready"), "served", "served_at"
+    )
@@ -1,38 +1,51 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 from sqlalchemy import select
 
 from app.database import db_dep
-from app.models import MenuCategory, MenuItem, MenuItemVariant
-from app.schemas import MenuCategoryRead, MenuItemRead, MenuItemVariantRead
+from app.fastjson import json_response
+from app.menu_snapshot import menu_snapshot, ACTIVE_VARIANTS, ITEM_IMAGE
+from app.models import Media, MenuCategory, MenuItem, MenuItemVariant
+from app.schemas import (
+    MenuCategoryRead,
+    MenuItemRead,
+    MenuItemVariantRead,
+    MenuFullRead,
+)
 
 router = APIRouter(prefix="/menu", tags=["Menu"])
 
 
+@router.get("/full/", responses={200: {"model": MenuFullRead}, 304: {}})
+async def get_full_menu(session: db_dep, request: Request):
+    """
+    Butun menyu bitta so'rovda: kategoriya -> taom -> variant.
+    ETag qaytaradi; If-None-Match mos kelsa 304 (body yo'q).
+    Siqilgan (br/gzip) nusxa snapshot bilan birga bir marta tayyorlanadi.
+    """
+    snapshot = await menu_snapshot.get(session)
+    return await snapshot.response(request)
 
 
 @router.get("/categories/", response_model=list[MenuCategoryRead])
-def get_categories(session: db_dep):
+async def get_categories(session: db_dep):
     """Barcha kategoriyalar (sort_order bo'yicha)"""
-    return (
-        session.execute(select(MenuCategory).order_by(MenuCategory.sort_order))
-        .scalars()
-        .all()
+    result = await session.execute(
+        select(MenuCategory).order_by(MenuCategory.sort_order)
     )
+    return result.scalars().all()
 
 
 @router.get("/categories/{category_id}/", response_model=MenuCategoryRead)
-def get_category(category_id: int, session: db_dep):
+async def get_category(category_id: int, session: db_dep):
     """Bitta kategoriya"""
-    category = session.get(MenuCategory, category_id)
+    category = await session.get(MenuCategory, category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Kategoriya topilmadi")
     return category
 
 
-
-
 @router.get("/items/", response_model=list[MenuItemRead])
-def get_items(
+async def get_items(
     session: db_dep,
     category_id: int | None = None,
     is_active: bool = True,
@@ -44,35 +57,98 @@ def get_items(
     - ?station=kitchen   — stantsiya bo'yicha filter
     - ?is_active=false   — o'chirilgan taomlarni ko'rish
     """
-    stmt = select(MenuItem).where(MenuItem.is_active == is_active)
+    # tez yo'l (app.fastjson): taomlar, variantlar va rasmlar ustunlar bilan,
+    # MenuItemRead shaklida yig'iladi
+    where = [MenuItem.is_active == is_active]
     if category_id is not None:
-        stmt = stmt.where(MenuItem.category_id == category_id)
+        where.append(MenuItem.category_id == category_id)
     if station is not None:
-        stmt = stmt.where(MenuItem.station == station)
-    return session.execute(stmt).scalars().all()
+        where.append(MenuItem.station == station)
+
+    items = (
+        await session.execute(
+            select(
+                MenuItem.id,
+                MenuItem.name,
+                MenuItem.description,
+                MenuItem.base_price,
+                MenuItem.station,
+                MenuItem.is_active,
+                MenuItem.category_id,
+                MenuItem.img_id,
+                Media.url,
+                Media.widths,
+            )
+            .outerjoin(Media, Media.id == MenuItem.img_id)
+            .where(*where)
+        )
+    ).all()
+
+    variants: dict[int, list[dict]] = {}
+    res = await session.execute(
+        select(
+            MenuItemVariant.menu_item_id,
+            MenuItemVariant.id,
+            MenuItemVariant.name,
+            MenuItemVariant.price_delta,
+            MenuItemVariant.is_active,
+        ).where(
+            MenuItemVariant.is_active == True,  # noqa: E712
+            MenuItemVariant.menu_item_id.in_(select(MenuItem.id).where(*where)),
+        )
+    )
+    for menu_item_id, *variant in res:
+        variants.setdefault(menu_item_id, []).append(
+            dict(zip(("id", "name", "price_delta", "is_active"), variant))
+        )
+
+    return json_response(
+        [
+            {
+                "id": item.id,
+                "name": item.name,
+                "description": item.description,
+                "base_price": float(item.base_price),
+                "station": item.station,
+                "is_active": item.is_active,
+                "category_id": item.category_id,
+                "img_id": item.img_id,
+                "variants": variants.get(item.id, []),
+                "img": (
+                    {
+                        "url": item.url,
+                        "variants": Media.variant_urls(item.url, item.widths),
+                    }
+                    if item.url is not None
+                    else None
+                ),
+            }
+            for item in items
+        ]
+    )
 
 
 @router.get("/items/{item_id}/", response_model=MenuItemRead)
-def get_item(item_id: int, session: db_dep):
+async def get_item(item_id: int, session: db_dep):
     """Bitta taom — variantlari bilan"""
-    item = session.get(MenuItem, item_id)
+    item = await session.get(MenuItem, item_id, options=[ACTIVE_VARIANTS, ITEM_IMAGE])
     if not item:
         raise HTTPException(status_code=404, detail="Taom topilmadi")
     return item
 
 
-
-
 @router.get("/items/{item_id}/variants/", response_model=list[MenuItemVariantRead])
-def get_variants(item_id: int, session: db_dep):
+async def get_variants(item_id: int, session: db_dep):
     """Taomning variantlari (katta/kichik porsiya va h.k.)"""
-    if not session.get(MenuItem, item_id):
+    if not await session.get(MenuItem, item_id):
         raise HTTPException(status_code=404, detail="Taom topilmadi")
     return (
-        session.execute(
-            select(MenuItemVariant).where(
-                MenuItemVariant.menu_item_id == item_id,
-                MenuItemVariant.is_active == True,  # noqa: E712
+        (
+            await session.execute(
+                select(MenuItemVariant).where(
+                    MenuItemVariant.menu_item_id == item_id,
+                    MenuItemVariant.is_active == True,  # noqa: E712
+                )
             )
         )
         .scalars()
@@ -0,0 +1,26 @@
+from fastapi import APIRouter
+
+from app.audit import audit
+from app.database import get_pool_status
+from app.dependencies import admin_user
+from app.utils import hash_stats
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+
+@router.get("/db-pool/")
+async def db_pool(user: admin_user):
+    """Connection pool holati: band, overflow va kutish vaqti"""
+    return get_pool_status()
+
+
+@router.get("/password-hash/")
+async def password_hash(user: admin_user):
+    """argon2 worker pool: navbat uzunligi va kutish vaqti"""
+    return hash_stats.as_dict()
+
+
+@router.get("/audit/")
+async def audit_writer(user: admin_user):
+    """Audit log navbati: kutayotgan, yozilgan va tashlangan eventlar"""
+    return audit.as_dict()
@@ -1,37 +1,124 @@
 from datetime import datetime
 
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import select
+from fastapi import APIRouter, HTTPException, Query, Body
+from sqlalchemy import select, insert, update, tuple_, func, and_
+from sqlalchemy.orm import selectinload
 
-from app.models import Order
+from app.config import settings
+from app.models import Order, OrderItem, Payment, MenuItem, MenuItemVariant
+from app.audit import audit
 from app.database import db_dep
-from app.schemas.schemas import OrderRead
+from app.fastjson import json_response
+from app.idempotency import IdempotentRoute
+from app.kitchen import notify_order_items
+from app.schemas.schemas import (
+    OrderRead,
+    OrderDetailRead,
+    OrderItemCreate,
+    OrderItemRead,
+)
+from app.utils import encode_cursor, decode_cursor, naive_local
 
 
-router = APIRouter(prefix="/orders", tags=["Orders"])
+router = APIRouter(prefix="/orders", tags=["Orders"], route_class=IdempotentRoute)
 
 
 @router.get("/", response_model=list[OrderRead])
-async def get_orders(session: db_dep, status: str | None = None):
-    stmt = select(Order)
+async def get_orders(
+    session: db_dep,
+    status: str | None = None,
+    table_id: int | None = None,
+    waiter_id: int | None = None,
+    opened_from: datetime | None = None,
+    opened_to: datetime | None = None,
+    cursor: str | None = None,
+    limit: int = Query(
+        settings.ORDERS_PAGE_SIZE, ge=1, le=settings.ORDERS_MAX_PAGE_SIZE
+    ),
+):
+    """
+    Buyurtmalar, eng yangisi birinchi (opened_at, id bo'yicha keyset).
+    Keyingi sahifa bo'lsa X-Next-Cursor headerida qaytadi, uni ?cursor= ga bering.
+    """
+    # tez yo'l (app.fastjson): OrderRead ustunlari + cursor uchun opened_at
+    stmt = select(Order.id, Order.waiter_id, Order.table_id, Order.opened_at)
 
     if status:
         stmt = stmt.where(Order.status == status)
+    if table_id is not None:
+        stmt = stmt.where(Order.table_id == table_id)
+    if waiter_id is not None:
+        stmt = stmt.where(Order.waiter_id == waiter_id)
+    if opened_from is not None:
+        stmt = stmt.where(Order.opened_at >= naive_local(opened_from))
+    if opened_to is not None:
+        stmt = stmt.where(Order.opened_at < naive_local(opened_to))
+    if cursor:
+        stmt = stmt.where(tuple_(Order.opened_at, Order.id) < decode_cursor(cursor))
 
-    res = session.execute(stmt)
-    return res.scalars().all()
+    stmt = stmt.order_by(Order.opened_at.desc(), Order.id.desc()).limit(limit + 1)
 
+    res = await session.execute(stmt)
+    orders = res.all()
 
-@router.get("/{order_id}/", response_model=OrderRead)
-async def get_order(session: db_dep, order_id: int):
-    stmt = select(Order).where(Order.id == order_id)
-    res = session.execute(stmt)
-    order = res.scalars().first()
+    headers = {}
+    if len(orders) > limit:
+        orders = orders[:limit]
+        headers["X-Next-Cursor"] = encode_cursor(orders[-1].opened_at, orders[-1].id)
 
-    if not order:
+    return json_response(
+        [
+            {"id": o.id, "waiter_id": o.waiter_id, "table_id": o.table_id}
+            for o in orders
+        ],
+        headers=headers,
+    )
+
+
+@router.get("/{order_id}/", response_model=OrderDetailRead | OrderRead)
+async def get_order(session: db_dep, order_id: int, detail: bool = False):
+    """
+    ?detail=true — qatorlar, to'lovlar va hisob (subtotal, paid, balance)
+    bilan; summalar SQL'da hisoblanadi, jami 3 ta so'rov.
+    """
+    if not detail:
+        stmt = select(Order).where(Order.id == order_id)
+        res = await session.execute(stmt)
+        order = res.scalars().first()
+
+        if not order:
+            raise HTTPException(status_code=404, detail="Order not found")
+
+        return OrderRead.model_validate(order, from_attributes=True)
+
+    subtotal = (
+        select(func.coalesce(func.sum(OrderItem.qty * OrderItem.unit_price), 0))
+        .where(OrderItem.order_id == Order.id)
+        .scalar_subquery()
+    )
+    paid = (
+        select(func.coalesce(func.sum(Payment.amount), 0))
+        .where(Payment.order_id == Order.id)
+        .scalar_subquery()
+    )
+    stmt = (
+        select(Order, subtotal, paid, subtotal - paid)
+        .where(Order.id == order_id)
+        .options(selectinload(Order.items), selectinload(Order.payments))
+    )
+    row = (await session.execute(stmt)).first()
+
+    if not row:
         raise HTTPException(status_code=404, detail="Order not found")
 
-    return order
+    order, subtotal, paid, balance = row
+    return OrderDetailRead.model_validate(order).model_copy(
+        update={
+            "subtotal": float(subtotal),
+            "paid": float(paid),
+            "balance": float(balance),
+        }
+    )
 
 
 @router.post("/open/", response_model=OrderRead)
@@ -39,8 +126,9 @@ async def open_order(session: db_dep, table_id: int, waiter_id: int):
     order = Order(table_id=table_id, waiter_id=waiter_id, status="open")
 
     session.add(order)
-    session.commit()
-    session.refresh(order)
+    await session.commit()
+    await session.refresh(order)
+    audit.log(waiter_id, "order", order.id, "open", {"table_id": table_id})
 
     return order
 
@@ -48,7 +136,7 @@ async def open_order(session: db_dep, table_id: int, waiter_id: int):
 @router.post("/{order_id}/submit/")
 async def submit_order(session: db_dep, order_id: int):
     stmt = select(Order).where(Order.id == order_id)
-    res = session.execute(stmt)
+    res = await session.execute(stmt)
     order = res.scalars().first()
 
     if not order:
@@ -60,25 +148,124 @@ async def submit_order(session: db_dep, order_id: int):
     order.status = "submitted"
     order.submitted_at = datetime.now()
 
-    session.commit()
-    session.refresh(order)
+    # yangi qatorlar oshxonaga: bitta UPDATE ... RETURNING, keyin NOTIFY
+    res = await session.scalars(
+        update(OrderItem)
+        .where(OrderItem.order_id == order_id, OrderItem.status == "new")
+        .values(status="sent", sent_at=order.submitted_at)
+        .returning(OrderItem)
+    )
+    sent = res.all()
+    await notify_order_items(session, sent)
+
+    await session.commit()
+    await session.refresh(order)
+    audit.log(None, "order", order_id, "submit", {"sent_items": len(sent)})
 
     return order
 
 
 @router.post("/{order_id}/close/")
 async def close_order(session: db_dep, order_id: int):
-    stmt = select(Order).where(Order.id == order_id)
-    res = session.execute(stmt)
+    # FOR UPDATE: ikki marta yopilib rollup'ga ikki marta qo'shilmasin
+    stmt = select(Order).where(Order.id == order_id).with_for_update()
+    res = await session.execute(stmt)
     order = res.scalars().first()
 
     if not order:
         raise HTTPException(status_code=404, detail="Order not found")
 
+    if order.status == "closed":
+        raise HTTPException(status_code=400, detail="Order is already closed")
+
+    # qatorlar sales_item_hourly'ga app.rollups mapper event'i orqali yoziladi
     order.status = "closed"
     order.closed_at = datetime.now()
 
-    session.commit()
-    session.refresh(order)
+    await session.commit()
+    await session.refresh(order)
+    audit.log(None, "order", order_id, "close")
 
     return order
+
+
+@router.post("/{order_id}/items/", response_model=list[OrderItemRead], status_code=201)
+async def add_order_items(
+    session: db_dep,
+    order_id: int,
+    lines: list[OrderItemCreate] = Body(..., min_length=1, max_length=200),
+):
+    """
+    Bir ekrandagi barcha qatorlarni birdaniga qo'shish.
+    Narxlar bitta so'rovda olinadi (base_price + price_delta),
+    qatorlar bitta multi-row INSERT bilan yoziladi.
+    """
+    order = await session.get(Order, order_id)
+
+    if not order:
+        raise HTTPException(status_code=404, detail="Order not found")
+
+    if order.status == "closed":
+        raise HTTPException(status_code=400, detail="Order is closed")
+
+    item_ids = {line.menu_item_id for line in lines}
+    variant_ids = {line.variant_id for line in lines if line.variant_id is not None}
+
+    stmt = (
+        select(
+            MenuItem.id,
+            MenuItem.base_price,
+            MenuItemVariant.id,
+            MenuItemVariant.price_delta,
+        )
+        .outerjoin(
+            MenuItemVariant,
+            and_(
+                MenuItemVariant.menu_item_id == MenuItem.id,
+                MenuItemVariant.id.in_(variant_ids),
+                MenuItemVariant.is_active == True,  # noqa: E712
+            ),
+        )
+        .where(MenuItem.id.in_(item_ids), MenuItem.is_active == True)  # noqa: E712
+    )
+    prices = {}
+    for item_id, base_price, variant_id, price_delta in await session.execute(stmt):
+        prices[(item_id, None)] = base_price
+        if variant_id is not None:
+            prices[(item_id, variant_id)] = base_price + price_delta
+
+    # yuborilgan buyurtmaga qo'shilgan qatorlar darhol oshxonaga ketadi
+    if order.status == "submitted":
+        status, sent_at = "sent", datetime.now()
+    else:
+        status, sent_at = "new", None
+
+    rows = []
+    for line in lines:
+        unit_price = prices.get((line.menu_item_id, line.variant_id))
+        if unit_price is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Menu item {line.menu_item_id} / variant {line.variant_id} "
+                "not available",
+            )
+        rows.append(
+            {
+                "order_id": order_id,
+                "menu_item_id": line.menu_item_id,
+                "variant_id": line.variant_id,
+                "qty": line.qty,
+                "unit_price": unit_price,
+                "status": status,
+                "note": line.note,
+                "sent_at": sent_at,
+            }
+        )
+
+    res = await session.scalars(insert(OrderItem).returning(OrderItem), rows)
+    items = res.all()
+    await notify_order_items(session, items)
+    await session.commit()
+    audit.log(None, "order", order_id, "add_items", {"item_ids": [i.id for i in items]})
+
+    return items
@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+from datetime import datetime
+from pydantic import BaseModel, Field
 from enum import Enum
 
 
@@ -9,6 +10,22 @@ class UserProfileResponse(BaseModel):
     avatar_url: str | None = None
 
 
+class AuthUser(BaseModel):
+    """Token egasi: auth tekshiruvlari va profil uchun yetarli maydonlar"""
+
+    id: int
+    username: str | None = None
+    first_name: str | None = None
+    last_name: str | None = None
+    role: str | None = None
+    is_active: bool = True
+    is_admin: bool = False
+    is_deleted: bool = False
+    avatar_url: str | None = None
+
+    model_config = {"frozen": True}
+
+
 class UserLoginRequest(BaseModel):
     username: str | None = None
     password: str | None = None
@@ -37,6 +54,7 @@ class TableCreate(TableBase):
 
 class TableRead(TableBase):
     id: int
+    version: int = 0
 
 class TableStatusChoise(str,Enum):
     FREE="free"
@@ -65,6 +83,19 @@ class MenuItemVariantRead(BaseModel):
     model_config = {"from_attributes": True}
 
 
+class ImageVariantRead(BaseModel):
+    width: int
+    webp: str
+    jpeg: str
+
+
+class ImageRead(BaseModel):
+    url: str  # asl fayl
+    variants: list[ImageVariantRead] = []  # kichikdan kattaga, srcset uchun
+
+    model_config = {"from_attributes": True}
+
+
 class MenuItemRead(BaseModel):
     id: int
     name: str
@@ -74,12 +105,102 @@ class MenuItemRead(BaseModel):
     is_active: bool
     category_id: int | None
     img_id: int | None  # rasm ID — frontend /static/uploads/ orqali oladi
+    img: ImageRead | None = None
     variants: list[MenuItemVariantRead] = []
 
     model_config = {"from_attributes": True}
 
 
+class MenuCategoryTree(MenuCategoryRead):
+    items: list[MenuItemRead] = []
+
+
+class MenuFullRead(BaseModel):
+    categories: list[MenuCategoryTree] = []
+    uncategorized: list[MenuItemRead] = []
+
+
 class OrderRead(BaseModel):
     id: int | None = None
     waiter_id: int | None = None
     table_id: int | None = None
+
+
+class OrderItemRead(BaseModel):
+    id: int
+    menu_item_id: int
+    variant_id: int | None = None
+    qty: int
+    unit_price: float
+    status: str
+    note: str | None = None
+    sent_at: datetime | None = None
+    ready_at: datetime | None = None
+    served_at: datetime | None = None
+
+    model_config = {"from_attributes": True}
+
+
+class OrderItemCreate(BaseModel):
+    menu_item_id: int
+    variant_id: int | None = None
+    qty: int = Field(1, ge=1)
+    note: str | None = Field(None, max_length=500)
+
+
+class PaymentRead(BaseModel):
+    id: int
+    cashier_id: int | None = None
+    method: str
+    amount: float
+    paid_at: datetime | None = None
+    receipt_no: str
+
+    model_config = {"from_attributes": True}
+
+
+class OrderDetailRead(OrderRead):
+    status: str
+    opened_at: datetime | None = None
+    submitted_at: datetime | None = None
+    closed_at: datetime | None = None
+    notes: str | None = None
+    items: list[OrderItemRead] = []
+    payments: list[PaymentRead] = []
+    subtotal: float = 0
+    paid: float = 0
+    balance: float = 0
+
+    model_config = {"from_attributes": True}
+
+
+class ReportGrain(str, Enum):
+    HOUR = "hour"
+    DAY = "day"
+    MONTH = "month"
+
+
+class SalesReportRow(BaseModel):
+    period: datetime
+    station: str
+    menu_item_id: int
+    qty: int
+    revenue: float
+
+
+class PaymentReportRow(BaseModel):
+    period: datetime
+    method: str
+    amount: float
+    payments: int
+
+
+class ExportDataset(str, Enum):
+    ORDERS = "orders"
+    ORDER_ITEMS = "order_items"
+    PAYMENTS = "payments"
+
+
+class ExportFormat(str, Enum):
+    CSV = "csv"
+    PARQUET = "parquet"
@@ -0,0 +1,83 @@
+import asyncio
+import hashlib
+import time
+from collections.abc import Awaitable, Callable
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.compression import Precompressed
+from app.config import settings
+
+
+class Snapshot(Precompressed):
+    def __init__(self, body: bytes):
+        super().__init__(body)
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{self.digest}"'
+
+    async def response(self, request: Request, headers: dict | None = None) -> Response:
+        """ETag bilan javob; If-None-Match mos kelsa 304 (body yo'q).
+        Siqilgan nusxalar boshqa baytlar: ETag'i ``"<hash>-br"`` / ``-gzip``."""
+        encoding = self.encoding_for(request)
+        etag = self.etag if encoding is None else f'"{self.digest}-{encoding}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache", **(headers or {})}
+        if etag in request.headers.get("if-none-match", ""):
+            # bo'sh body'ga middleware Vary qo'shmaydi
+            headers["Vary"] = "Accept-Encoding"
+            return Response(status_code=304, headers=headers)
+        return await super().response(request, headers)
+
+
+class SnapshotCache:
+    """Tayyor JSON baytlari (menyu, stollar).
+
+    O'zgarish bo'lganda (commit'dan keyin NOTIFY keladi) tashlab yuboriladi
+    va keyingi so'rovda qayta quriladi. LISTEN ulanishi bo'lmasa (masalan,
+    DB_PGBOUNCER) boshqa workerdagi o'zgarish bilinmaydi: snapshot
+    ``SNAPSHOT_TTL_SECONDS`` qayta ishlatiladi va arzon darajada siqiladi.
+    Qayta qurilayotganda eski snapshot bor bo'lsa kutmasdan o'sha beriladi.
+    """
+
+    def __init__(
+        self,
+        build: Callable[[AsyncSession], Awaitable[Snapshot]],
+        ttl: float = settings.SNAPSHOT_TTL_SECONDS,
+    ):
+        self._build = build
+        self._ttl = ttl
+        self._snapshot: Snapshot | None = None
+        self._expires = 0.0
+        self._lock = asyncio.Lock()
+        self.ready = False
+        self.generation = 0
+
+    def invalidate(self):
+        self.generation += 1
+        self._snapshot = None
+
+    def _fresh(self) -> Snapshot | None:
+        if self._snapshot is None:
+            return None
+        if not self.ready and self._expires < time.monotonic():
+            return None
+        return self._snapshot
+
+    async def get(self, session: AsyncSession) -> Snapshot:
+        if snapshot := self._fresh():
+            return snapshot
+        if self._lock.locked() and self._snapshot is not None:
+            # muddati o'tgan, lekin invalidate qilinmagan: quruvchini kutmaymiz
+            return self._snapshot
+
+        async with self._lock:
+            if snapshot := self._fresh():
+                return snapshot
+            generation, ready = self.generation, self.ready
+            snapshot = await self._build(session)
+            # NOTIFY'siz snapshot qisqa yashaydi: brotli 11 / gzip 9 arzimaydi
+            snapshot.best = ready
+            if generation == self.generation:
+                self._snapshot = snapshot
+                self._expires = time.monotonic() + self._ttl
+            return snapshot
@@ -0,0 +1,61 @@
+import mimetypes
+import os
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+from starlette.types import Scope
+
+
+# fayl nomlari sha256 (yoki eski uuid): nom o'zgarmaguncha tarkib o'zgarmaydi
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+# webp variant beriladigan rasm turlari (app.images yozadi)
+RASTER_TYPES = {"image/jpeg", "image/png", "image/gif"}
+
+
+def _stat(path: str) -> os.stat_result | None:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+class UploadFiles(StaticFiles):
+    """
+    /static/uploads: uzoq muddatli cache, kuchli ETag, Range (FileResponse).
+    Klient qabul qilsa asl rasm o'rniga kichikroq ``<nom>.webp`` beriladi
+    (Accept: image/webp).
+    """
+
+    def file_response(
+        self,
+        full_path,
+        stat_result: os.stat_result,
+        scope: Scope,
+        status_code: int = 200,
+    ) -> Response:
+        request_headers = Headers(scope=scope)
+        full_path = os.fspath(full_path)
+        stem = os.path.splitext(os.path.basename(full_path))[0]
+        media_type = mimetypes.guess_type(full_path)[0] or "application/octet-stream"
+        headers = {"cache-control": IMMUTABLE, "etag": f'"{stem}"'}
+
+        if media_type in RASTER_TYPES:
+            headers["vary"] = "Accept"
+            if "image/webp" in request_headers.get("accept", ""):
+                path = os.path.join(os.path.dirname(full_path), f"{stem}.webp")
+                if (st := _stat(path)) and st.st_size < stat_result.st_size:
+                    full_path, stat_result, media_type = path, st, "image/webp"
+                    headers["etag"] = f'"{stem}-webp"'
+
+        response = FileResponse(
+            full_path,
+            status_code=status_code,
+            headers=headers,
+            media_type=media_type,
+            stat_result=stat_result,
+        )
+        if self.is_not_modified(response.headers, request_headers):
+            return NotModifiedResponse(response.headers)
+        return response
@@ -0,0 +1,79 @@
+import json
+
+import orjson
+
+from sqlalchemy import event, inspect, select, func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.broker import EventBroker
+from app.fastjson import rows
+from app.models import DiningTable
+from app.snapshot import Snapshot, SnapshotCache
+
+
+TABLE_CHANNEL = "table_status"
+FLOOR = "floor"
+
+table_broker = EventBroker()
+
+
+def table_delta(table_id: int, status: str | None, version: int) -> str:
+    """Ixcham delta: [table_id, status, version]; o'chirilgan stol -> status null."""
+    return json.dumps([table_id, status, version], separators=(",", ":"))
+
+
+async def build_tables_snapshot(session: AsyncSession) -> Snapshot:
+    """GET /tables/ (filtersiz) javobi: TableRead ro'yxati."""
+    stmt = select(
+        DiningTable.id,
+        DiningTable.table_no,
+        DiningTable.capacity,
+        DiningTable.status,
+        DiningTable.version,
+    ).order_by(DiningTable.id)
+    return Snapshot(orjson.dumps(rows(await session.execute(stmt))))
+
+
+tables_snapshot = SnapshotCache(build_tables_snapshot)
+
+
+def on_table_notify(connection, pid, channel, payload: str):
+    tables_snapshot.invalidate()
+    table_broker.publish(FLOOR, payload)
+
+
+async def notify_table(session: AsyncSession, table: DiningTable):
+    tables_snapshot.invalidate()
+    payload = table_delta(table.id, table.status, table.version)
+    await session.execute(select(func.pg_notify(TABLE_CHANNEL, payload)))
+
+
+async def floor_snapshot(session: AsyncSession) -> list[list]:
+    stmt = select(DiningTable.id, DiningTable.status, DiningTable.version).order_by(
+        DiningTable.id
+    )
+    return [list(row) for row in await session.execute(stmt)]
+
+
+@event.listens_for(DiningTable, "before_update")
+def _bump_table_version(mapper, connection, target: DiningTable):
+    if inspect(target).attrs.status.history.has_changes():
+        target.version = (target.version or 0) + 1
+
+
+def _notify(connection, payload: str):
+    tables_snapshot.invalidate()
+    connection.execute(select(func.pg_notify(TABLE_CHANNEL, payload)))
+
+
+@event.listens_for(DiningTable, "after_insert")
+@event.listens_for(DiningTable, "after_update")
+def _notify_table_changed(mapper, connection, target: DiningTable):
+    # admin panel va ORM orqali o'zgarishlar; bulk UPDATE o'zi NOTIFY yuboradi
+    _notify(connection, table_delta(target.id, target.status, target.version or 0))
+
+
+@event.listens_for(DiningTable, "after_delete")
+def _notify_table_deleted(mapper, connection, target: DiningTable):
+    # after_delete ichida inspect(target).deleted hali False
+    _notify(connection, table_delta(target.id, None, target.version or 0))
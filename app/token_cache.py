@@ -0,0 +1,86 @@
+import asyncio
+import logging
+import time
+
+from jose import jwt, JWTError
+from sqlalchemy import select, delete, func
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import TokenBlacklist
+
+
+logger = logging.getLogger(__name__)
+
+REVOCATION_CHANNEL = "token_revoked"
+
+
+def token_exp(token: str) -> float:
+    try:
+        return float(jwt.get_unverified_claims(token).get("exp", 0))
+    except JWTError:
+        return 0.0
+
+
+class RevocationCache:
+    """Bekor qilingan tokenlar (sha256 hash -> exp) jarayon ichidagi nusxasi.
+
+    ``ready`` faqat LISTEN ulanishi tirik bo'lganda True bo'ladi; aks holda
+    ``is_revoked`` None qaytaradi va chaqiruvchi bazadan tekshiradi.
+    """
+
+    def __init__(self):
+        self._revoked: dict[str, float] = {}
+        self.ready = False
+
+    def add(self, token_hash: str, exp: float):
+        if exp > time.time():
+            self._revoked[token_hash] = exp
+
+    def is_revoked(self, token_hash: str) -> bool | None:
+        if not self.ready:
+            return None
+        return token_hash in self._revoked
+
+    def prune(self):
+        now = time.time()
+        self._revoked = {h: exp for h, exp in self._revoked.items() if exp > now}
+
+    def __len__(self):
+        return len(self._revoked)
+
+
+revocation_cache = RevocationCache()
+
+
+def notify_payload(token_hash: str, exp: float) -> str:
+    return f"{token_hash}:{int(exp)}"
+
+
+def on_revocation_notify(connection, pid, channel, payload: str):
+    token_hash, _, exp = payload.partition(":")
+    revocation_cache.add(token_hash, float(exp or 0))
+
+
+async def load_revocations():
+    stmt = select(TokenBlacklist.token_hash, TokenBlacklist.expires_at).where(
+        TokenBlacklist.expires_at > func.now()
+    )
+    async with SessionLocal() as session:
+        for token_hash, expires_at in await session.execute(stmt):
+            revocation_cache.add(token_hash, expires_at.timestamp())
+
+
+async def purge_revocations():
+    """Muddati o'tgan tokenlar qora ro'yxatda turishi shart emas."""
+    while True:
+        try:
+            async with SessionLocal() as session:
+                await session.execute(
+                    delete(TokenBlacklist).where(TokenBlacklist.expires_at < func.now())
+                )
+                await session.commit()
+        except Exception as e:
+            logger.warning("Token blacklist purge failed: %s", e)
+
+        await asyncio.sleep(settings.TOKEN_BLACKLIST_PURGE_MINUTES * 60)
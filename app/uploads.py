@@ -0,0 +1,92 @@
+"""
+Fayl yuklash xizmati (avatar, taom rasmi).
+
+Fayl bo'lak-bo'lak, event loop'dan tashqarida (thread) diskka yoziladi,
+hajmi ``UPLOAD_MAX_BYTES`` bilan cheklanadi va sha256 bo'yicha nomlanadi.
+Bir xil fayl qayta yuklansa yangi fayl yozilmaydi, mavjud Media qaytadi.
+"""
+
+import asyncio
+import hashlib
+import os
+import uuid
+
+from fastapi import HTTPException, UploadFile
+from sqlalchemy import event, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Media
+
+
+UPLOAD_DIR = settings.MEDIA_PATH
+UPLOAD_URL = "/static/uploads"
+CHUNK_SIZE = 1024 * 1024
+# yangi Media commit bo'ldi: app.images pipeline'ini uyg'otadi
+new_uploads = asyncio.Event()
+
+
+def safe_ext(filename: str | None) -> str:
+    _, ext = os.path.splitext(filename or "")
+    return ext.lower()[:10] if ext else ""
+
+
+def _copy_to_disk(src, dest: str, limit: int) -> tuple[str, int]:
+    """Thread ichida: oqimni diskka yozadi, sha256 va hajmni qaytaradi."""
+    digest = hashlib.sha256()
+    size = 0
+    with open(dest, "wb") as out:
+        while chunk := src.read(CHUNK_SIZE):
+            size += len(chunk)
+            if size > limit:
+                raise HTTPException(status_code=413, detail="File too large")
+            digest.update(chunk)
+            out.write(chunk)
+    return digest.hexdigest(), size
+
+
+async def save_upload(session: AsyncSession, upload: UploadFile) -> Media:
+    """Faylni saqlaydi va unga mos Media'ni qaytaradi (flush qilingan, commit emas)."""
+    if upload.size is not None and upload.size > settings.UPLOAD_MAX_BYTES:
+        raise HTTPException(status_code=413, detail="File too large")
+
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    tmp_path = os.path.join(UPLOAD_DIR, f".tmp-{uuid.uuid4().hex}")
+
+    try:
+        await upload.seek(0)
+        sha256, size = await asyncio.to_thread(
+            _copy_to_disk, upload.file, tmp_path, settings.UPLOAD_MAX_BYTES
+        )
+
+        media = await session.scalar(select(Media).where(Media.sha256 == sha256))
+        if media is not None:
+            return media
+
+        filename = f"{sha256}{safe_ext(upload.filename)}"
+        # nom tarkibdan olingan: bor bo'lsa ham xuddi shu baytlar
+        await asyncio.to_thread(
+            os.replace, tmp_path, os.path.join(UPLOAD_DIR, filename)
+        )
+
+        # parallel bir xil yuklash bo'lsa ham bitta qator qoladi
+        media_id = await session.scalar(
+            pg_insert(Media)
+            .values(url=f"{UPLOAD_URL}/{filename}", sha256=sha256, size=size)
+            .on_conflict_do_nothing(index_elements=["sha256"])
+            .returning(Media.id)
+        )
+        if media_id is None:
+            return await session.scalar(select(Media).where(Media.sha256 == sha256))
+        # variantlar commit'dan keyin fon process'da yoziladi (app.images)
+        event.listen(
+            session.sync_session,
+            "after_commit",
+            lambda s: new_uploads.set(),
+            once=True,
+        )
+        return await session.get(Media, media_id)
+    finally:
+        if os.path.exists(tmp_path):
+            await asyncio.to_thread(os.remove, tmp_path)
@@ -0,0 +1,87 @@
+import time
+from collections import OrderedDict
+
+from sqlalchemy import event, select, func
+
+from app.config import settings
+from app.models import User
+from app.schemas import AuthUser
+
+
+USER_CHANNEL = "user_changed"
+
+
+class UserCache:
+    """``sub`` -> AuthUser, LRU + TTL.
+
+    Revocation cache kabi faqat LISTEN ulanishi tirik bo'lganda ishlaydi,
+    aks holda ``get`` None qaytaradi va user bazadan olinadi.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: OrderedDict[int, tuple[float, AuthUser]] = OrderedDict()
+        self.ready = False
+        # har bir invalidate'da oshadi: eski o'qish yangi ma'lumot ustiga yozilmasin
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, user_id: int) -> AuthUser | None:
+        entry = self._items.get(user_id) if self.ready else None
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self._items.move_to_end(user_id)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, user: AuthUser, generation: int):
+        if not self.ready or generation != self.generation:
+            return
+        self._items[user.id] = (time.monotonic() + self.ttl, user)
+        self._items.move_to_end(user.id)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        self.generation += 1
+        self._items.pop(user_id, None)
+
+    def clear(self):
+        self.generation += 1
+        self._items.clear()
+
+
+user_cache = UserCache(
+    maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL_SECONDS
+)
+
+
+def to_auth_user(user: User) -> AuthUser:
+    return AuthUser(
+        id=user.id,
+        username=user.username,
+        first_name=user.first_name,
+        last_name=user.last_name,
+        role=user.role,
+        is_active=user.is_active,
+        is_admin=user.is_admin,
+        is_deleted=user.is_deleted,
+        avatar_url=(user.avatar.url if user.avatar else None),
+    )
+
+
+def on_user_notify(connection, pid, channel, payload: str):
+    user_id = int(payload)
+    user_cache.invalidate(user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _notify_user_changed(mapper, connection, target: User):
+    # admin panel, update_me va boshqa har qanday ORM o'zgarishi shu yerdan
+    # o'tadi; NOTIFY commit bo'lganda barcha workerlarga yetadi
+    user_cache.invalidate(target.id)
+    connection.execute(select(func.pg_notify(USER_CHANNEL, str(target.id))))
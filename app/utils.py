@@ -1,3 +1,8 @@
+import asyncio
+import base64
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone, timedelta
 from fastapi import HTTPException
 from passlib.context import CryptContext
@@ -20,6 +25,66 @@ def verify_password(plain_password: str, hashed_password: str):
     return pwd_context.verify(plain_password, hashed_password)
 
 
+class HashStats:
+    """argon2 navbati: nechta so'rov kutyapti, qancha kutdi."""
+
+    def __init__(self):
+        self.queued = 0
+        self.max_queued = 0
+        self.running = 0
+        self.completed = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "workers": settings.PASSWORD_HASH_WORKERS,
+            "queued": self.queued,
+            "max_queued": self.max_queued,
+            "running": self.running,
+            "completed": self.completed,
+            "wait_avg_ms": (
+                self.wait_total / self.completed * 1000 if self.completed else 0.0
+            ),
+            "wait_max_ms": self.wait_max * 1000,
+        }
+
+
+hash_stats = HashStats()
+
+_hash_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="argon2"
+)
+_hash_slots = asyncio.Semaphore(settings.PASSWORD_HASH_WORKERS)
+
+
+async def _run_hasher(fn, *args):
+    # navbat executor ichida emas, semaphore'da turadi: shunda uni o'lchash mumkin
+    hash_stats.queued += 1
+    hash_stats.max_queued = max(hash_stats.max_queued, hash_stats.queued)
+    start = time.perf_counter()
+    async with _hash_slots:
+        wait = time.perf_counter() - start
+        hash_stats.queued -= 1
+        hash_stats.running += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(_hash_executor, fn, *args)
+        finally:
+            hash_stats.running -= 1
+            hash_stats.completed += 1
+            hash_stats.wait_total += wait
+            hash_stats.wait_max = max(hash_stats.wait_max, wait)
+
+
+async def hash_password_async(password: str):
+    return await _run_hasher(hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str):
+    return await _run_hasher(verify_password, plain_password, hashed_password)
+
+
 def generate_jwt_tokens(user_id: int, is_access_only: bool = False):
     access_token = jwt.encode(
         algorithm=settings.ALGORITHM,
@@ -47,6 +112,31 @@ def generate_jwt_tokens(user_id: int, is_access_only: bool = False):
     return access_token, refresh_token
 
 
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def naive_local(value: datetime | None) -> datetime | None:
+    """Timezone'li vaqtni server vaqtiga o'tkazadi (DateTime ustunlari naive)."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+def encode_cursor(opened_at: datetime, row_id: int) -> str:
+    raw = f"{opened_at.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        opened_at, row_id = raw.split("|")
+        return datetime.fromisoformat(opened_at), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
 def decode_jwt_token(token: str):
     try:
         payload = jwt.decode(
@@ -0,0 +1,92 @@
+"""Concurrent-request throughput against a running API.
+
+Run the server (``uvicorn app.main:app --workers 1``) on the commit you want to
+measure, then:
+
+    python benchmarks/concurrent_requests.py --base-url http://127.0.0.1:8000 \
+        --username waiter --password secret --concurrency 50 --requests 2000
+
+Run it once on the sync (psycopg2) tree and once on the async (asyncpg) tree
+with the same database to compare the two.
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+ENDPOINTS = ["/tables/", "/menu/categories/", "/menu/items/", "/user/profile/"]
+
+
+async def _login(client: httpx.AsyncClient, username: str, password: str) -> str:
+    res = await client.post(
+        "/auth/login/", data={"username": username, "password": password}
+    )
+    res.raise_for_status()
+    return res.json()["access_token"]
+
+
+async def _worker(
+    client: httpx.AsyncClient,
+    headers: dict,
+    queue: asyncio.Queue,
+    latencies: list[float],
+    errors: list[int],
+):
+    while True:
+        try:
+            path = queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        res = await client.get(path, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        if res.status_code >= 400:
+            errors.append(res.status_code)
+
+
+async def run(args):
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits) as client:
+        token = await _login(client, args.username, args.password)
+        headers = {"Authorization": f"Bearer {token}"}
+
+        queue: asyncio.Queue = asyncio.Queue()
+        for i in range(args.requests):
+            queue.put_nowait(ENDPOINTS[i % len(ENDPOINTS)])
+
+        latencies: list[float] = []
+        errors: list[int] = []
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                _worker(client, headers, queue, latencies, errors)
+                for _ in range(args.concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"requests:    {len(latencies)} ({len(errors)} errors)")
+    print(f"concurrency: {args.concurrency}")
+    print(f"throughput:  {len(latencies) / elapsed:.1f} req/s")
+    print(f"latency p50: {statistics.median(latencies) * 1000:.1f} ms")
+    print(f"latency p95: {p95 * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--username", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
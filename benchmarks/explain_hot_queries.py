@@ -0,0 +1,237 @@
+"""EXPLAIN the router hot-path queries and fail on sequential scans.
+
+The planner picks a seq scan on tiny tables regardless of indexes, so the
+large tables are first seeded with ``--rows`` orders (and proportional
+lines, payments, menu items and audit events) and ANALYZEd, all inside a
+transaction that is rolled back at the end:
+
+    python benchmarks/explain_hot_queries.py --rows 100000
+
+With ``--rows 0`` nothing is seeded and the existing data is used. Exits
+with status 2 if a large table still has fewer than ``--min-rows`` rows
+(the plans would mean nothing) and with status 1 if any plan scans one of
+the large tables sequentially (partitions with fewer than ``--min-rows``
+rows excepted).
+"""
+
+import argparse
+import asyncio
+import sys
+import uuid
+from datetime import datetime
+
+from sqlalchemy import Integer, String, bindparam, literal_column, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+
+from app.audit import ensure_partitions
+from app.database import engine
+from app.models import AuditLog, MenuItem, MenuItemVariant, Order, OrderItem, Payment
+
+
+LARGE_TABLES = {
+    "orders",
+    "order_item",
+    "payment",
+    "menu_item",
+    "menu_item_variant",
+    "audit_log",
+}
+
+QUERIES = {
+    "orders by status": select(Order)
+    .where(Order.status == "open")
+    .order_by(Order.opened_at.desc(), Order.id.desc())
+    .limit(51),
+    "orders by table": select(Order).where(Order.table_id == 1).limit(51),
+    "orders by waiter": select(Order).where(Order.waiter_id == 1).limit(51),
+    "orders keyset page": select(Order)
+    .where(tuple_(Order.opened_at, Order.id) < (datetime(2026, 1, 1), 1000))
+    .order_by(Order.opened_at.desc(), Order.id.desc())
+    .limit(51),
+    "open orders of a table": select(Order).where(
+        Order.table_id == 1, Order.status.in_(["open", "submitted"])
+    ),
+    "order items of an order": select(OrderItem).where(OrderItem.order_id == 1),
+    "order items by status": select(OrderItem).where(OrderItem.status == "sent"),
+    "payments of an order": select(Payment).where(Payment.order_id == 1),
+    "active items of a category": select(MenuItem).where(
+        MenuItem.category_id == 1,
+        MenuItem.is_active == True,  # noqa: E712
+    ),
+    "active variants of items": select(MenuItemVariant).where(
+        MenuItemVariant.menu_item_id.in_([1, 2, 3]),
+        MenuItemVariant.is_active == True,  # noqa: E712
+    ),
+    "audit log of an entity": select(AuditLog).where(
+        AuditLog.entity == "order", AuditLog.entity_id == 1
+    ),
+    "audit log of a user this week": select(AuditLog).where(
+        AuditLog.user_id == 1, AuditLog.created_at >= datetime(2026, 1, 1)
+    ),
+    # literal_binds cannot render a JSONB value: this is the same comparison
+    # as meta.contains({"order_id": 1}), written as a literal
+    "audit log by meta order_id": select(AuditLog).where(
+        AuditLog.meta.op("@>")(literal_column("""'{"order_id": 1}'::jsonb"""))
+    ),
+}
+
+
+# parents first; every row carries :tag so children can find their parents.
+# Hot statuses ('open', 'sent') are rare, as in a live restaurant.
+SEED = [
+    """
+    INSERT INTO users
+        (username, role, password_hash, is_active, is_admin, is_deleted,
+         created_at, updated_at)
+    SELECT :tag || '-' || g, 'waiter', '-', true, false, false, now(), now()
+    FROM generate_series(1, 20) g
+    """,
+    """
+    INSERT INTO dining_table
+        (table_no, capacity, status, version, created_at, updated_at)
+    SELECT :tag || '-' || g, 4, 'free', 0, now(), now()
+    FROM generate_series(1, 50) g
+    """,
+    """
+    INSERT INTO menu_category (name, sort_order, created_at, updated_at)
+    SELECT :tag, g, now(), now() FROM generate_series(1, 100) g
+    """,
+    """
+    INSERT INTO menu_item
+        (category_id, name, description, base_price, station, is_active,
+         created_at, updated_at)
+    SELECT c.ids[1 + g % 100], :tag, '-', 45000, 'kitchen', g % 10 > 0,
+           now(), now()
+    FROM generate_series(1, greatest(:rows / 50, 1)) g,
+         (SELECT array_agg(id) AS ids FROM menu_category WHERE name = :tag) c
+    """,
+    """
+    INSERT INTO menu_item_variant
+        (menu_item_id, name, price_delta, is_active, created_at, updated_at)
+    SELECT m.id, :tag, 1500, k = 1, now(), now()
+    FROM menu_item m, generate_series(1, 2) k
+    WHERE m.name = :tag
+    """,
+    """
+    INSERT INTO orders
+        (table_id, waiter_id, status, opened_at, notes, created_at, updated_at)
+    SELECT t.ids[1 + g % 50], w.ids[1 + g % 20],
+           CASE WHEN g % 100 = 0 THEN 'open' ELSE 'closed' END,
+           now() - g * interval '1 minute', :tag, now(), now()
+    FROM generate_series(1, :rows) g,
+         (SELECT array_agg(id) AS ids FROM dining_table
+          WHERE table_no LIKE :tag || '-%') t,
+         (SELECT array_agg(id) AS ids FROM users
+          WHERE username LIKE :tag || '-%') w
+    """,
+    """
+    INSERT INTO order_item
+        (order_id, menu_item_id, qty, unit_price, status, created_at, updated_at)
+    SELECT o.id, m.ids[1 + (o.id * 3 + k) % array_length(m.ids, 1)], 1, 45000,
+           CASE WHEN o.status = 'open' THEN 'sent' ELSE 'served' END,
+           now(), now()
+    FROM orders o, generate_series(1, 3) k,
+         (SELECT array_agg(id) AS ids FROM menu_item WHERE name = :tag) m
+    WHERE o.notes = :tag
+    """,
+    """
+    INSERT INTO payment
+        (order_id, method, amount, paid_at, receipt_no, created_at, updated_at)
+    SELECT o.id, 'cash', 135000, o.opened_at, :tag || '-' || o.id, now(), now()
+    FROM orders o
+    WHERE o.notes = :tag AND o.status = 'closed'
+    """,
+    """
+    INSERT INTO audit_log (user_id, entity, entity_id, action, meta)
+    SELECT o.waiter_id, 'order', o.id, 'add_items',
+           jsonb_build_object('order_id', o.id)
+    FROM orders o
+    WHERE o.notes = :tag
+    """,
+]
+
+
+async def _seed(conn, rows: int):
+    params = {"tag": f"explain-{uuid.uuid4().hex[:8]}", "rows": rows}
+    # typed binds: asyncpg cannot infer :tag used both as text and varchar
+    types = {"tag": String, "rows": Integer}
+    for sql in SEED:
+        stmt = text(sql).bindparams(
+            *(
+                bindparam(name, type_=t)
+                for name, t in types.items()
+                if f":{name}" in sql
+            )
+        )
+        await conn.execute(stmt, params)
+    # statistics are transactional too: the plans below see the seeded rows
+    for table in sorted(LARGE_TABLES):
+        await conn.execute(text(f"ANALYZE {table}"))
+
+
+async def _too_small(conn, min_rows: int) -> list[str]:
+    small = []
+    for table in sorted(LARGE_TABLES):
+        count = await conn.scalar(text(f"SELECT count(*) FROM {table}"))
+        if count < min_rows:
+            small.append(f"{table} ({count} rows)")
+    return small
+
+
+def _seq_scans(plan: dict, sizes: dict[str, float], min_rows: int) -> list[str]:
+    found = []
+    relation = plan.get("Relation Name", "")
+    # audit_log partitions are named audit_log_yYYYYmMM; empty (future) ones are
+    # rightly scanned sequentially. reltuples is -1 if never analyzed.
+    if (
+        plan.get("Node Type") == "Seq Scan"
+        and relation.split("_y")[0] in LARGE_TABLES
+        and not 0 <= sizes.get(relation, -1) < min_rows
+    ):
+        found.append(relation)
+    for child in plan.get("Plans", []):
+        found += _seq_scans(child, sizes, min_rows)
+    return found
+
+
+async def run(args) -> int:
+    failed = 0
+    if args.rows:
+        # the current month's audit_log partition
+        await ensure_partitions()
+    async with engine.connect() as conn:
+        if args.rows:
+            await _seed(conn, args.rows)
+        small = await _too_small(conn, args.min_rows)
+        if small:
+            print(f"fewer than {args.min_rows} rows: {', '.join(small)}")
+            await engine.dispose()
+            return 2
+
+        sizes = dict(
+            (await conn.execute(text("SELECT relname, reltuples FROM pg_class"))).all()
+        )
+        for name, stmt in QUERIES.items():
+            sql = stmt.compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+            res = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}")
+            plan = res.scalar()[0]["Plan"]
+            scans = _seq_scans(plan, sizes, args.min_rows)
+            status = f"SEQ SCAN on {', '.join(scans)}" if scans else "ok"
+            print(f"{name:32} {status}")
+            failed += bool(scans)
+        await conn.rollback()
+    await engine.dispose()
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--min-rows", type=int, default=1_000)
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,151 @@
+"""Count the SQL statements of the menu read paths and fail on N+1 queries.
+
+Seeds a throwaway category with menu items (each with an image and active
+variants) inside a transaction that is rolled back at the end, then calls
+get_full_menu, get_items and get_item at every size and counts the
+statements they send (``before_cursor_execute``):
+
+    python benchmarks/menu_query_count.py --sizes 50 500 --variants 3
+
+Exits with status 1 if any path's statement count changes with the number of
+items. Needs the usual .env and a migrated database.
+"""
+
+import argparse
+import asyncio
+import sys
+
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.database import engine
+from app.menu_snapshot import menu_snapshot
+from app.models import Media, MenuCategory, MenuItem, MenuItemVariant
+from app.routers.menu import get_full_menu, get_item, get_items
+from app.schemas import MenuItemRead
+
+
+class StatementCounter:
+    def __init__(self):
+        self.active = False
+        self.count = 0
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += self.active
+
+    async def measure(self, session: AsyncSession, call) -> int:
+        # nothing may come from the identity map of an earlier call
+        session.expunge_all()
+        self.count, self.active = 0, True
+        try:
+            await call()
+        finally:
+            self.active = False
+        return self.count
+
+
+async def _seed(session: AsyncSession, category_id: int, count: int, variants: int):
+    media_ids = (
+        await session.scalars(
+            insert(Media).returning(Media.id),
+            [{"url": f"/static/uploads/bench-{i}.jpg"} for i in range(count)],
+        )
+    ).all()
+    item_ids = (
+        await session.scalars(
+            insert(MenuItem).returning(MenuItem.id),
+            [
+                {
+                    "category_id": category_id,
+                    "name": f"Bench item {i}",
+                    "img_id": media_id,
+                    "description": "benchmark",
+                    "base_price": 45000,
+                    "station": "kitchen",
+                    "is_active": True,
+                }
+                for i, media_id in enumerate(media_ids)
+            ],
+        )
+    ).all()
+    await session.execute(
+        insert(MenuItemVariant),
+        [
+            {
+                "menu_item_id": item_id,
+                "name": f"variant {v}",
+                "price_delta": 1500,
+                "is_active": True,
+            }
+            for item_id in item_ids
+            for v in range(variants)
+        ],
+    )
+    return item_ids[-1]
+
+
+async def run(args) -> int:
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+    request = Request(
+        {"type": "http", "method": "GET", "path": "/menu/full/", "headers": []}
+    )
+
+    counts: dict[str, list[int]] = {}
+    async with engine.connect() as conn:
+        async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+            category_id = await session.scalar(
+                insert(MenuCategory)
+                .values(name="Benchmark", sort_order=0)
+                .returning(MenuCategory.id)
+            )
+            seeded = 0
+            for size in sorted(args.sizes):
+                item_id = await _seed(
+                    session, category_id, size - seeded, args.variants
+                )
+                seeded = size
+
+                async def full_menu():
+                    # measure the build, not the cached snapshot
+                    menu_snapshot.invalidate()
+                    await get_full_menu(session, request)
+
+                async def one_item(item_id=item_id):
+                    MenuItemRead.model_validate(await get_item(item_id, session))
+
+                for name, call in (
+                    ("get_full_menu", full_menu),
+                    ("get_items", lambda: get_items(session, category_id=category_id)),
+                    ("get_item", one_item),
+                ):
+                    counts.setdefault(name, []).append(
+                        await counter.measure(session, call)
+                    )
+        await conn.rollback()
+    await engine.dispose()
+
+    sizes = sorted(args.sizes)
+    print(f"{'path':<16}" + "".join(f"{f'{n} items':>12}" for n in sizes))
+    failed = 0
+    for name, values in counts.items():
+        ok = len(set(values)) == 1
+        failed += not ok
+        print(
+            f"{name:<16}"
+            + "".join(f"{v:>12}" for v in values)
+            + ("" if ok else "  FAIL: depends on item count")
+        )
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--variants", type=int, default=3)
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""argon2 login throughput for one worker process.
+
+Uses the same CryptContext as the app (app.utils.pwd_context), so the cost
+parameters measured are the configured ones. Needs the usual .env (Settings
+is loaded on import).
+
+    python benchmarks/password_hashing.py --logins 200 --concurrency 32
+
+Reports verifications/s when verifying inline on the event loop (old
+behaviour) and through verify_password_async with PASSWORD_HASH_WORKERS
+threads, plus how long a trivial coroutine was delayed while logins ran.
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.config import settings
+from app.utils import hash_password, hash_stats, verify_password, verify_password_async
+
+
+async def _inline(hashed: str, n: int):
+    for _ in range(n):
+        verify_password("secret", hashed)
+        await asyncio.sleep(0)
+
+
+async def _offloaded(hashed: str, n: int, concurrency: int):
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with sem:
+            await verify_password_async("secret", hashed)
+
+    await asyncio.gather(*(one() for _ in range(n)))
+
+
+async def _loop_lag(stop: asyncio.Event) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.001)
+        worst = max(worst, time.perf_counter() - start - 0.001)
+    return worst
+
+
+async def _measure(coro) -> tuple[float, float]:
+    stop = asyncio.Event()
+    lag = asyncio.create_task(_loop_lag(stop))
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    stop.set()
+    return elapsed, await lag
+
+
+async def run(args):
+    hashed = hash_password("secret")
+    print(f"argon2 hash: {hashed.split('$')[3]}")
+    print(f"workers:     {settings.PASSWORD_HASH_WORKERS}")
+
+    elapsed, lag = await _measure(_inline(hashed, args.logins))
+    print(
+        f"inline:      {args.logins / elapsed:.1f} verify/s, "
+        f"max loop lag {lag * 1000:.1f} ms"
+    )
+
+    elapsed, lag = await _measure(_offloaded(hashed, args.logins, args.concurrency))
+    stats = hash_stats.as_dict()
+    print(
+        f"offloaded:   {args.logins / elapsed:.1f} verify/s, "
+        f"max loop lag {lag * 1000:.1f} ms, "
+        f"queue wait avg {stats['wait_avg_ms']:.1f} ms / max {stats['wait_max_ms']:.1f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
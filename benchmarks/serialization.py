@@ -0,0 +1,168 @@
+"""JSON serialization cost of the hot list endpoints, without a database.
+
+Compares, for /tables/, /menu/items/ and /orders/ shaped rows:
+
+  response_model  ORM objects -> TypeAdapter(list[Model]) validation
+                  (from_attributes) -> pydantic-core JSON (FastAPI's path)
+  encoder         the same models -> jsonable_encoder -> stdlib json
+                  (what older FastAPI versions did)
+  fast            SELECT-shaped tuples -> dicts -> orjson (app.fastjson)
+
+ORM rows are transient instances built in memory, so hydration from the
+database is not included; the fast path also skips that in production.
+Needs the usual .env (Settings is loaded on import).
+
+    python benchmarks/serialization.py --rows 1000 10000 --repeat 5
+"""
+
+import argparse
+import json
+import time
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+
+from app.fastjson import json_response
+from app.models import DiningTable, Media, MenuItem, MenuItemVariant, Order
+from app.schemas import MenuItemRead, OrderRead, TableRead
+
+
+def _tables(n: int):
+    cols = ("id", "table_no", "capacity", "status", "version")
+    tuples = [(i, f"T{i}", 4, "free", i % 7) for i in range(n)]
+    objs = [DiningTable(**dict(zip(cols, t))) for t in tuples]
+    return TableRead, objs, lambda: [dict(zip(cols, t)) for t in tuples]
+
+
+def _menu_items(n: int):
+    widths = [120, 320, 640]
+    objs, items, variants = [], [], {}
+    for i in range(n):
+        url = f"/static/uploads/{i:064x}.jpg"
+        row = (i, f"Taom {i}", "Mol go'shti, guruch, sabzi", 45000, "kitchen")
+        items.append((*row, True, i % 20, i, url, widths))
+        variants[i] = [
+            (v, f"variant {v}", Decimal("1500.00"), True) for v in (2 * i, 2 * i + 1)
+        ]
+        objs.append(
+            MenuItem(
+                **dict(
+                    zip(("id", "name", "description", "base_price", "station"), row)
+                ),
+                is_active=True,
+                category_id=i % 20,
+                img_id=i,
+                img=Media(id=i, url=url, widths=widths),
+                variants=[
+                    MenuItemVariant(id=v, name=name, price_delta=d, is_active=a)
+                    for v, name, d, a in variants[i]
+                ],
+            )
+        )
+
+    # same assembly as app.routers.menu.get_items
+    def rows():
+        return [
+            {
+                "id": id_,
+                "name": name,
+                "description": description,
+                "base_price": float(base_price),
+                "station": station,
+                "is_active": is_active,
+                "category_id": category_id,
+                "img_id": img_id,
+                "variants": [
+                    dict(zip(("id", "name", "price_delta", "is_active"), v))
+                    for v in variants.get(id_, [])
+                ],
+                "img": {"url": url, "variants": Media.variant_urls(url, widths)},
+            }
+            for (
+                id_,
+                name,
+                description,
+                base_price,
+                station,
+                is_active,
+                category_id,
+                img_id,
+                url,
+                widths,
+            ) in items
+        ]
+
+    return MenuItemRead, objs, rows
+
+
+def _orders(n: int):
+    cols = ("id", "waiter_id", "table_id")
+    tuples = [(i, i % 15, i % 40) for i in range(n)]
+    objs = [Order(**dict(zip(cols, t))) for t in tuples]
+    return OrderRead, objs, lambda: [dict(zip(cols, t)) for t in tuples]
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _measure(model, objs, rows, repeat: int) -> tuple[float, float, float]:
+    adapter = TypeAdapter(list[model])
+
+    def response_model():
+        adapter.dump_json(adapter.validate_python(objs, from_attributes=True))
+
+    def encoder():
+        json.dumps(
+            jsonable_encoder(adapter.validate_python(objs, from_attributes=True)),
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+
+    def fast():
+        json_response(rows())
+
+    # both paths must describe the same payload
+    expected = adapter.validate_python(objs, from_attributes=True)
+    assert adapter.validate_json(json_response(rows()).body) == expected
+
+    return (
+        _best(response_model, repeat),
+        _best(encoder, repeat),
+        _best(fast, repeat),
+    )
+
+
+def run(args):
+    print(
+        f"{'endpoint':<14}{'rows':>7}{'response_model':>16}{'encoder':>10}"
+        f"{'fast':>9}{'speedup':>9}"
+    )
+    for name, build in (
+        ("/tables/", _tables),
+        ("/menu/items/", _menu_items),
+        ("/orders/", _orders),
+    ):
+        for n in args.rows:
+            slow, legacy, quick = _measure(*build(n), args.repeat)
+            print(
+                f"{name:<14}{n:>7}{slow * 1000:>13.1f} ms{legacy * 1000:>7.1f} ms"
+                f"{quick * 1000:>6.1f} ms{slow / quick:>8.1f}x"
+            )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    run(parser.parse_args())
+
+
+if __name__ == "__main__":
+    main()
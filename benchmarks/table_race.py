@@ -0,0 +1,62 @@
+"""Hammer one table's reserve endpoint from many clients at once.
+
+Against a running API with at least one table:
+
+    python benchmarks/table_race.py --base-url http://127.0.0.1:8000 \
+        --table-id 1 --clients 100 --rounds 20
+
+Each round frees the table, fires ``--clients`` concurrent reserves and checks
+that exactly one gets 200 and all the others get 409. Exits with status 1 on
+any round with a different outcome. tests/test_table_race.py makes the same
+assertion in-process against the database.
+"""
+
+import argparse
+import asyncio
+import sys
+from collections import Counter
+
+import httpx
+
+
+async def _round(client: httpx.AsyncClient, table_id: int, clients: int) -> Counter:
+    # leftover from the previous round; 409 if it is already free
+    await client.post(f"/tables/{table_id}/release/")
+
+    start = asyncio.Event()
+
+    async def reserve():
+        await start.wait()
+        res = await client.post(f"/tables/{table_id}/reserve/")
+        return res.status_code
+
+    tasks = [asyncio.create_task(reserve()) for _ in range(clients)]
+    await asyncio.sleep(0)
+    start.set()
+    return Counter(await asyncio.gather(*tasks))
+
+
+async def run(args) -> int:
+    limits = httpx.Limits(max_connections=args.clients)
+    failed = 0
+    async with httpx.AsyncClient(base_url=args.base_url, limits=limits) as client:
+        for i in range(args.rounds):
+            codes = await _round(client, args.table_id, args.clients)
+            ok = codes[200] == 1 and codes[409] == args.clients - 1
+            failed += not ok
+            print(f"round {i + 1:3}: {dict(codes)} {'ok' if ok else 'FAIL'}")
+        await client.post(f"/tables/{args.table_id}/release/")
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--table-id", type=int, default=1)
+    parser.add_argument("--clients", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=20)
+    return asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,34 @@
+"""add media widths
+
+Revision ID: 232338f44ca3
+Revises: ed31296262fe
+Create Date: 2026-10-18 18:41:12.307519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = "232338f44ca3"
+down_revision: Union[str, Sequence[str], None] = "ed31296262fe"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL - variantlar hali yozilmagan: app.images eski rasmlarni ham ishlaydi
+    op.add_column(
+        "media",
+        sa.Column("widths", postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("media", "widths")
@@ -0,0 +1,32 @@
+"""add dining table version
+
+Revision ID: 2899201bb579
+Revises: 96f9fd65b24a
+Create Date: 2026-10-18 13:04:52.318406
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2899201bb579"
+down_revision: Union[str, Sequence[str], None] = "96f9fd65b24a"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "dining_table",
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("dining_table", "version")
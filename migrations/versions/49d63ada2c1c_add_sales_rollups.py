@@ -0,0 +1,47 @@
+"""add sales rollups
+
+Revision ID: 49d63ada2c1c
+Revises: 2899201bb579
+Create Date: 2026-10-18 14:21:09.774032
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "49d63ada2c1c"
+down_revision: Union[str, Sequence[str], None] = "2899201bb579"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "sales_item_hourly",
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("station", sa.String(), nullable=False),
+        sa.Column("menu_item_id", sa.BigInteger(), nullable=False),
+        sa.Column("qty", sa.Integer(), nullable=False),
+        sa.Column("revenue", sa.Numeric(), nullable=False),
+        sa.PrimaryKeyConstraint("hour", "station", "menu_item_id"),
+    )
+    op.create_table(
+        "sales_payment_hourly",
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("method", sa.String(), nullable=False),
+        sa.Column("amount", sa.Numeric(), nullable=False),
+        sa.Column("payments", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("hour", "method"),
+    )
+    # mavjud tarix: python -m app.rollups --from <birinchi kun>
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table("sales_payment_hourly")
+    op.drop_table("sales_item_hourly")
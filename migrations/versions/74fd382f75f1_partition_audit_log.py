@@ -0,0 +1,140 @@
+"""partition audit_log
+
+Revision ID: 74fd382f75f1
+Revises: dae2bc08fde8
+Create Date: 2026-10-18 16:48:03.552917
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "74fd382f75f1"
+down_revision: Union[str, Sequence[str], None] = "dae2bc08fde8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# eski ma'lumotning birinchi oyidan boshlab, hozirgi oydan 3 oy oldinga
+# (keyingilarini app.audit.maintain_partitions yaratadi)
+CREATE_PARTITIONS = """
+DO $$
+DECLARE
+    month date;
+BEGIN
+    FOR month IN
+        SELECT generate_series(
+            date_trunc('month', LEAST(
+                (SELECT min(created_at) FROM audit_log_old), now()
+            ))::date,
+            (date_trunc('month', now()) + interval '3 months')::date,
+            interval '1 month'
+        )::date
+    LOOP
+        EXECUTE format(
+            'CREATE TABLE IF NOT EXISTS %I PARTITION OF audit_log '
+            'FOR VALUES FROM (%L) TO (%L)',
+            'audit_log_' || to_char(month, '"y"YYYY"m"MM'),
+            month,
+            month + interval '1 month'
+        );
+    END LOOP;
+END $$
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # nomlar (pkey, index) schema bo'yicha unikal: eskisini chetga olamiz
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_old")
+    op.execute(
+        "ALTER TABLE audit_log_old RENAME CONSTRAINT audit_log_pkey "
+        "TO audit_log_old_pkey"
+    )
+    op.execute("DROP INDEX IF EXISTS ix_audit_log_entity_entity_id")
+    op.execute("ALTER SEQUENCE audit_log_id_seq OWNED BY NONE")
+
+    op.execute(
+        """
+        CREATE TABLE audit_log (
+            id bigint NOT NULL DEFAULT nextval('audit_log_id_seq'),
+            user_id bigint REFERENCES users (id),
+            entity varchar NOT NULL,
+            entity_id bigint NOT NULL,
+            action varchar NOT NULL,
+            meta jsonb NOT NULL,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            updated_at timestamptz NOT NULL DEFAULT now(),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("ALTER SEQUENCE audit_log_id_seq OWNED BY audit_log.id")
+    op.execute(CREATE_PARTITIONS)
+
+    op.execute(
+        """
+        INSERT INTO audit_log
+            (id, user_id, entity, entity_id, action, meta, created_at, updated_at)
+        SELECT id, user_id, entity, entity_id, action, meta::jsonb,
+               created_at, updated_at
+        FROM audit_log_old
+        """
+    )
+    op.execute("DROP TABLE audit_log_old")
+
+    # "order X ning barcha o'zgarishlari" / "user Y shu hafta"
+    op.create_index(
+        "ix_audit_log_entity_entity_id_created_at",
+        "audit_log",
+        ["entity", "entity_id", "created_at"],
+    )
+    op.create_index(
+        "ix_audit_log_user_id_created_at", "audit_log", ["user_id", "created_at"]
+    )
+    # meta @> '{"order_id": X}' (qatorlar, to'lovlar)
+    op.create_index(
+        "ix_audit_log_meta",
+        "audit_log",
+        ["meta"],
+        postgresql_using="gin",
+        postgresql_ops={"meta": "jsonb_path_ops"},
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE audit_log RENAME TO audit_log_partitioned")
+    op.execute("ALTER SEQUENCE audit_log_id_seq OWNED BY NONE")
+    op.execute(
+        """
+        CREATE TABLE audit_log (
+            id bigint NOT NULL DEFAULT nextval('audit_log_id_seq'),
+            user_id bigint REFERENCES users (id),
+            entity varchar NOT NULL,
+            entity_id bigint NOT NULL,
+            action varchar NOT NULL,
+            meta json NOT NULL,
+            created_at timestamptz NOT NULL,
+            updated_at timestamptz NOT NULL
+        )
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO audit_log
+            (id, user_id, entity, entity_id, action, meta, created_at, updated_at)
+        SELECT id, user_id, entity, entity_id, action, meta::json,
+               created_at, updated_at
+        FROM audit_log_partitioned
+        """
+    )
+    op.execute("DROP TABLE audit_log_partitioned")
+    op.execute("ALTER TABLE audit_log ADD CONSTRAINT audit_log_pkey PRIMARY KEY (id)")
+    op.execute("ALTER SEQUENCE audit_log_id_seq OWNED BY audit_log.id")
+    op.create_index(
+        "ix_audit_log_entity_entity_id", "audit_log", ["entity", "entity_id"]
+    )
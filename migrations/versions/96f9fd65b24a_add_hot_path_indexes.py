@@ -0,0 +1,74 @@
+"""add hot path indexes
+
+Revision ID: 96f9fd65b24a
+Revises: fcf8b8dd0a76
+Create Date: 2026-10-18 11:02:17.583120
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "96f9fd65b24a"
+down_revision: Union[str, Sequence[str], None] = "fcf8b8dd0a76"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (nomi, jadval, ustunlar, partial WHERE)
+INDEXES = [
+    ("ix_orders_status", "orders", ["status"], None),
+    ("ix_orders_table_id", "orders", ["table_id"], None),
+    ("ix_orders_waiter_id", "orders", ["waiter_id"], None),
+    ("ix_orders_opened_at_id", "orders", ["opened_at", "id"], None),
+    (
+        "ix_orders_open_table_id",
+        "orders",
+        ["table_id"],
+        "status IN ('open', 'submitted')",
+    ),
+    ("ix_order_item_order_id", "order_item", ["order_id"], None),
+    ("ix_order_item_status", "order_item", ["status"], None),
+    ("ix_payment_order_id", "payment", ["order_id"], None),
+    ("ix_menu_item_category_id", "menu_item", ["category_id"], None),
+    ("ix_menu_item_active_category_id", "menu_item", ["category_id"], "is_active"),
+    ("ix_menu_item_variant_menu_item_id", "menu_item_variant", ["menu_item_id"], None),
+    (
+        "ix_menu_item_variant_active_menu_item_id",
+        "menu_item_variant",
+        ["menu_item_id"],
+        "is_active",
+    ),
+    ("ix_audit_log_entity_entity_id", "audit_log", ["entity", "entity_id"], None),
+]
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY: ishlab turgan bazada jadvalga yozishni bloklamaydi
+    with op.get_context().autocommit_block():
+        for name, table, columns, where in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                postgresql_where=sa.text(where) if where else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(
+                name,
+                table_name=table,
+                postgresql_concurrently=True,
+                if_exists=True,
+            )
@@ -0,0 +1,32 @@
+"""add media processing_at
+
+Revision ID: a07920e96b14
+Revises: d26b3f002268
+Create Date: 2026-10-18 21:05:37.418260
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a07920e96b14"
+down_revision: Union[str, Sequence[str], None] = "d26b3f002268"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "media",
+        sa.Column("processing_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("media", "processing_at")
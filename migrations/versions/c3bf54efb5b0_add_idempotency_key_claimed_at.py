@@ -0,0 +1,38 @@
+"""add idempotency_key claimed_at
+
+Revision ID: c3bf54efb5b0
+Revises: a07920e96b14
+Create Date: 2026-10-18 21:26:08.573194
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3bf54efb5b0"
+down_revision: Union[str, Sequence[str], None] = "a07920e96b14"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # mavjud qatorlar hozir band qilingan deb olinadi
+    op.add_column(
+        "idempotency_key",
+        sa.Column(
+            "claimed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.text("now()"),
+            nullable=False,
+        ),
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column("idempotency_key", "claimed_at")
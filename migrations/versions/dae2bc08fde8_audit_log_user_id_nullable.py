@@ -0,0 +1,34 @@
+"""audit log user_id nullable
+
+Revision ID: dae2bc08fde8
+Revises: 49d63ada2c1c
+Create Date: 2026-10-18 15:37:20.116824
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "dae2bc08fde8"
+down_revision: Union[str, Sequence[str], None] = "49d63ada2c1c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.alter_column(
+        "audit_log", "user_id", existing_type=sa.BigInteger(), nullable=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DELETE FROM audit_log WHERE user_id IS NULL")
+    op.alter_column(
+        "audit_log", "user_id", existing_type=sa.BigInteger(), nullable=False
+    )
@@ -0,0 +1,34 @@
+"""add media sha256
+
+Revision ID: ed31296262fe
+Revises: 74fd382f75f1
+Create Date: 2026-10-18 17:55:36.902114
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "ed31296262fe"
+down_revision: Union[str, Sequence[str], None] = "74fd382f75f1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # eski yozuvlar uchun bo'sh: ular dedup'da qatnashmaydi
+    op.add_column("media", sa.Column("sha256", sa.String(64), nullable=True))
+    op.add_column("media", sa.Column("size", sa.BigInteger(), nullable=True))
+    op.create_unique_constraint(op.f("media_sha256_key"), "media", ["sha256"])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint(op.f("media_sha256_key"), "media", type_="unique")
+    op.drop_column("media", "size")
+    op.drop_column("media", "sha256")
@@ -0,0 +1,93 @@
+"""hash tokenblacklist
+
+Revision ID: fcf8b8dd0a76
+Revises: 01807c169da0
+Create Date: 2026-10-18 10:12:41.204519
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "fcf8b8dd0a76"
+down_revision: Union[str, Sequence[str], None] = "01807c169da0"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+JWT_EXP_FUNCTION = """
+CREATE FUNCTION pg_temp.jwt_exp(token text) RETURNS timestamptz AS $$
+DECLARE
+    payload text := split_part(token, '.', 2);
+BEGIN
+    RETURN to_timestamp((
+        convert_from(decode(
+            translate(payload, '-_', '+/')
+            || repeat('=', (4 - length(payload) % 4) % 4),
+            'base64'
+        ), 'UTF8')::json ->> 'exp'
+    )::double precision);
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "token_blacklist", sa.Column("token_hash", sa.String(64), nullable=True)
+    )
+    op.add_column(
+        "token_blacklist",
+        sa.Column("expires_at", sa.DateTime(timezone=True), nullable=True),
+    )
+
+    # logout har qanday satrni qabul qilgan: JWT bo'lmaganlari keraksiz
+    op.execute(
+        "DELETE FROM token_blacklist "
+        "WHERE token !~ '^[A-Za-z0-9_-]+\\.[A-Za-z0-9_-]+\\.[A-Za-z0-9_-]*$'"
+    )
+
+    # mavjud tokenlarni hash + exp ga o'tkazish (JWT payload'dagi exp SQL'da
+    # o'qiladi, shuning uchun --sql rejimida ham ishlaydi). Regex'dan o'tgan,
+    # lekin base64/UTF-8/JSON/exp buzuq satr migratsiyani to'xtatmasin:
+    # xato bo'lsa NULL, quyida o'chiriladi
+    op.execute(JWT_EXP_FUNCTION)
+    op.execute(
+        """
+        UPDATE token_blacklist SET
+            token_hash = encode(sha256(convert_to(token, 'UTF8')), 'hex'),
+            expires_at = pg_temp.jwt_exp(token)
+        """
+    )
+    op.execute("DROP FUNCTION pg_temp.jwt_exp(text)")
+    op.execute(
+        "DELETE FROM token_blacklist WHERE expires_at IS NULL OR expires_at < now()"
+    )
+
+    op.drop_constraint("token_blacklist_pkey", "token_blacklist", type_="primary")
+    op.drop_column("token_blacklist", "token")
+    op.alter_column("token_blacklist", "token_hash", nullable=False)
+    op.alter_column("token_blacklist", "expires_at", nullable=False)
+    op.create_primary_key("token_blacklist_pkey", "token_blacklist", ["token_hash"])
+    op.create_index(
+        op.f("ix_token_blacklist_expires_at"), "token_blacklist", ["expires_at"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # hash'dan tokenni tiklab bo'lmaydi: qora ro'yxat bo'shatiladi
+    op.drop_index(op.f("ix_token_blacklist_expires_at"), table_name="token_blacklist")
+    op.execute("DELETE FROM token_blacklist")
+    op.drop_constraint("token_blacklist_pkey", "token_blacklist", type_="primary")
+    op.drop_column("token_blacklist", "expires_at")
+    op.drop_column("token_blacklist", "token_hash")
+    op.add_column("token_blacklist", sa.Column("token", sa.String(), nullable=False))
+    op.create_primary_key("token_blacklist_pkey", "token_blacklist", ["token"])
@@ -0,0 +1,34 @@
+"""A rejected audit event is dropped alone, not with its whole batch."""
+
+import pytest
+from sqlalchemy import delete, func, select
+
+from app.audit import AuditWriter, ensure_partitions
+from app.database import SessionLocal
+from app.models import AuditLog
+
+pytestmark = pytest.mark.anyio
+
+ENTITY = "test-audit"
+
+
+async def test_bad_event_does_not_drop_the_batch(db):
+    await ensure_partitions()
+    writer = AuditWriter(maxsize=100, batch_size=10, interval=1)
+    for entity_id in range(10):
+        # no such user: violates the user_id foreign key
+        user_id = -1 if entity_id == 6 else None
+        writer.log(user_id, ENTITY, entity_id, "test")
+    try:
+        await writer.stop()
+
+        async with SessionLocal() as session:
+            written = await session.scalar(
+                select(func.count()).where(AuditLog.entity == ENTITY)
+            )
+        assert written == 9
+        assert (writer.stats.written, writer.stats.failed) == (9, 1)
+    finally:
+        async with SessionLocal() as session:
+            await session.execute(delete(AuditLog).where(AuditLog.entity == ENTITY))
+            await session.commit()
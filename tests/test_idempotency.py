@@ -0,0 +1,164 @@
+"""A retry whose original response was never stored does not run the mutation
+again."""
+
+import uuid
+from datetime import timedelta
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import delete, func, insert, select, update
+
+from app import idempotency
+from app.database import SessionLocal
+from app.models import (
+    DiningTable,
+    IdempotencyKey,
+    MenuCategory,
+    MenuItem,
+    Order,
+    OrderItem,
+    User,
+)
+from app.routers.order import router
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+async def committed_order(db):
+    async with SessionLocal() as session:
+        waiter_id = await session.scalar(
+            insert(User)
+            .values(
+                username=f"test-{uuid.uuid4().hex}", role="waiter", password_hash="x"
+            )
+            .returning(User.id)
+        )
+        table_id = await session.scalar(
+            insert(DiningTable)
+            .values(table_no="test-idem", capacity=2, status="occupied", version=0)
+            .returning(DiningTable.id)
+        )
+        category_id = await session.scalar(
+            insert(MenuCategory)
+            .values(name="Test", sort_order=0)
+            .returning(MenuCategory.id)
+        )
+        menu_item_id = await session.scalar(
+            insert(MenuItem)
+            .values(
+                category_id=category_id,
+                name="Test item",
+                description="test",
+                base_price=45000,
+                station="test",
+                is_active=True,
+            )
+            .returning(MenuItem.id)
+        )
+        order_id = await session.scalar(
+            insert(Order)
+            .values(table_id=table_id, waiter_id=waiter_id, status="open")
+            .returning(Order.id)
+        )
+        await session.commit()
+    yield order_id, menu_item_id
+    async with SessionLocal() as session:
+        await session.execute(delete(OrderItem).where(OrderItem.order_id == order_id))
+        await session.execute(delete(Order).where(Order.id == order_id))
+        await session.execute(delete(MenuItem).where(MenuItem.id == menu_item_id))
+        await session.execute(
+            delete(MenuCategory).where(MenuCategory.id == category_id)
+        )
+        await session.execute(delete(DiningTable).where(DiningTable.id == table_id))
+        await session.execute(delete(User).where(User.id == waiter_id))
+        await session.commit()
+
+
+async def test_retry_after_lost_response_does_not_repeat_mutation(
+    committed_order, monkeypatch
+):
+    order_id, menu_item_id = committed_order
+    key = f"test-{uuid.uuid4().hex}"
+    app = FastAPI()
+    app.include_router(router)
+
+    async def lost(key, response):
+        # worker died after the endpoint committed, before the response was stored
+        pass
+
+    monkeypatch.setattr(idempotency, "_store", lost)
+
+    async def post():
+        return await client.post(
+            f"/orders/{order_id}/items/",
+            json=[{"menu_item_id": menu_item_id}],
+            headers={"Idempotency-Key": key},
+        )
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://t"
+        ) as client:
+            assert (await post()).status_code == 201
+
+            # within the lease the response may still be on its way
+            res = await post()
+            assert res.status_code == 409
+            assert "Retry-After" in res.headers
+
+            async with SessionLocal() as session:
+                await session.execute(
+                    update(IdempotencyKey)
+                    .where(IdempotencyKey.key == key)
+                    .values(claimed_at=func.now() - timedelta(hours=1))
+                )
+                await session.commit()
+
+            res = await post()
+            assert res.status_code == 409
+            assert "Retry-After" not in res.headers
+
+        async with SessionLocal() as session:
+            items = await session.scalar(
+                select(func.count()).where(OrderItem.order_id == order_id)
+            )
+        assert items == 1
+    finally:
+        async with SessionLocal() as session:
+            await session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.key == key)
+            )
+            await session.commit()
+
+
+async def test_stored_response_is_replayed(committed_order):
+    order_id, menu_item_id = committed_order
+    key = f"test-{uuid.uuid4().hex}"
+    app = FastAPI()
+    app.include_router(router)
+
+    transport = httpx.ASGITransport(app=app)
+    try:
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://t"
+        ) as client:
+            responses = [
+                await client.post(
+                    f"/orders/{order_id}/items/",
+                    json=[{"menu_item_id": menu_item_id}],
+                    headers={"Idempotency-Key": key},
+                )
+                for _ in range(2)
+            ]
+        assert [r.status_code for r in responses] == [201, 201]
+        assert responses[1].headers["Idempotent-Replayed"] == "true"
+        assert responses[1].json() == responses[0].json()
+    finally:
+        async with SessionLocal() as session:
+            await session.execute(
+                delete(IdempotencyKey).where(IdempotencyKey.key == key)
+            )
+            await session.commit()
@@ -0,0 +1,50 @@
+"""Kitchen item status transitions are guarded like the table transitions."""
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert
+
+from app.models import OrderItem
+from app.routers.kitchen import item_ready, item_served
+
+pytestmark = pytest.mark.anyio
+
+
+async def _item(session, order, menu_item, status: str) -> int:
+    return await session.scalar(
+        insert(OrderItem)
+        .values(
+            order_id=order.id,
+            menu_item_id=menu_item.id,
+            qty=1,
+            unit_price=45000,
+            status=status,
+        )
+        .returning(OrderItem.id)
+    )
+
+
+async def _status(call, session, item_id: int) -> int:
+    try:
+        await call(session, item_id)
+    except HTTPException as e:
+        return e.status_code
+    return 200
+
+
+async def test_item_status_transitions(session, order, menu_item):
+    item_id = await _item(session, order, menu_item, "sent")
+
+    assert await _status(item_ready, session, item_id) == 200
+    assert await _status(item_ready, session, item_id) == 409
+    assert await _status(item_served, session, item_id) == 200
+    assert await _status(item_ready, session, item_id) == 409
+    assert await _status(item_served, session, item_id) == 409
+    assert await _status(item_ready, session, 0) == 404
+
+
+async def test_new_and_cancelled_items_are_not_marked_ready(session, order, menu_item):
+    for status in ("new", "cancelled"):
+        item_id = await _item(session, order, menu_item, status)
+        assert await _status(item_ready, session, item_id) == 409
+        assert await _status(item_served, session, item_id) == 409
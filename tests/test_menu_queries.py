@@ -0,0 +1,107 @@
+"""The menu read paths send a fixed number of statements (no N+1)."""
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.requests import Request
+
+from app.menu_snapshot import menu_snapshot
+from app.models import Media, MenuCategory, MenuItem, MenuItemVariant
+from app.routers.menu import get_full_menu, get_item, get_items
+from app.schemas import MenuItemRead
+
+pytestmark = pytest.mark.anyio
+
+# menu_category + items (with image) + variants
+FULL_MENU_STATEMENTS = 4
+ITEMS_STATEMENTS = 2
+ITEM_STATEMENTS = 3
+
+
+async def _seed(session: AsyncSession, category_id: int, count: int) -> int:
+    media_ids = (
+        await session.scalars(
+            insert(Media).returning(Media.id),
+            [{"url": f"/static/uploads/test-{i}.jpg"} for i in range(count)],
+        )
+    ).all()
+    item_ids = (
+        await session.scalars(
+            insert(MenuItem).returning(MenuItem.id),
+            [
+                {
+                    "category_id": category_id,
+                    "name": f"Test item {i}",
+                    "img_id": media_id,
+                    "description": "test",
+                    "base_price": 45000,
+                    "station": "kitchen",
+                    "is_active": True,
+                }
+                for i, media_id in enumerate(media_ids)
+            ],
+        )
+    ).all()
+    await session.execute(
+        insert(MenuItemVariant),
+        [
+            {"menu_item_id": item_id, "name": name, "price_delta": 0, "is_active": True}
+            for item_id in item_ids
+            for name in ("kichik", "katta")
+        ],
+    )
+    return item_ids[-1]
+
+
+async def _count(db, session: AsyncSession, call) -> int:
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    session.expunge_all()
+    event.listen(db.sync_engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        await call()
+    finally:
+        event.remove(db.sync_engine, "before_cursor_execute", before_cursor_execute)
+    return len(statements)
+
+
+async def test_menu_statement_count_does_not_grow_with_items(db):
+    request = Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+    expected = {
+        "get_full_menu": FULL_MENU_STATEMENTS,
+        "get_items": ITEMS_STATEMENTS,
+        "get_item": ITEM_STATEMENTS,
+    }
+    async with db.connect() as conn:
+        async with AsyncSession(bind=conn, expire_on_commit=False) as session:
+            category_id = await session.scalar(
+                insert(MenuCategory)
+                .values(name="Test", sort_order=0)
+                .returning(MenuCategory.id)
+            )
+            seeded = 0
+            for size in (5, 500):
+                item_id = await _seed(session, category_id, size - seeded)
+                seeded = size
+
+                async def full_menu():
+                    # measure the build, not the cached snapshot
+                    menu_snapshot.invalidate()
+                    await get_full_menu(session, request)
+
+                async def items():
+                    await get_items(session, category_id=category_id)
+
+                async def one_item(item_id=item_id):
+                    MenuItemRead.model_validate(await get_item(item_id, session))
+
+                counts = {
+                    "get_full_menu": await _count(db, session, full_menu),
+                    "get_items": await _count(db, session, items),
+                    "get_item": await _count(db, session, one_item),
+                }
+                assert counts == expected, f"{size} items"
+        await conn.rollback()
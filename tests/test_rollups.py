@@ -0,0 +1,76 @@
+"""Closed orders and later edits of their items keep sales_item_hourly exact."""
+
+import pytest
+from sqlalchemy import select
+
+from app import rollups  # noqa: F401  (registers the mapper events)
+from app.models import OrderItem, SalesItemHourly
+
+pytestmark = pytest.mark.anyio
+
+
+async def _rollup(session, menu_item) -> tuple:
+    row = (
+        await session.execute(
+            select(SalesItemHourly.qty, SalesItemHourly.revenue).where(
+                SalesItemHourly.menu_item_id == menu_item.id
+            )
+        )
+    ).one_or_none()
+    return (0, 0) if row is None else (int(row.qty), int(row.revenue))
+
+
+async def test_close_without_closed_at_is_rolled_up(session, order, menu_item):
+    session.add(
+        OrderItem(
+            order_id=order.id,
+            menu_item_id=menu_item.id,
+            qty=2,
+            unit_price=45000,
+            status="served",
+        )
+    )
+    await session.commit()
+    # the admin panel only changes the status and leaves closed_at empty
+    order.status = "closed"
+    await session.commit()
+
+    assert order.closed_at is not None
+    assert await _rollup(session, menu_item) == (2, 90000)
+
+
+async def test_item_edits_after_close_are_re_rolled(session, order, menu_item):
+    item = OrderItem(
+        order_id=order.id,
+        menu_item_id=menu_item.id,
+        qty=2,
+        unit_price=45000,
+        status="served",
+    )
+    session.add(item)
+    order.status = "closed"
+    await session.commit()
+
+    item.qty = 3
+    await session.commit()
+    assert await _rollup(session, menu_item) == (3, 135000)
+
+    session.add(
+        OrderItem(
+            order_id=order.id,
+            menu_item_id=menu_item.id,
+            qty=1,
+            unit_price=45000,
+            status="served",
+        )
+    )
+    await session.commit()
+    assert await _rollup(session, menu_item) == (4, 180000)
+
+    await session.delete(item)
+    await session.commit()
+    assert await _rollup(session, menu_item) == (1, 45000)
+
+    order.status = "submitted"
+    await session.commit()
+    assert await _rollup(session, menu_item) == (0, 0)
@@ -0,0 +1,63 @@
+"""Without LISTEN the snapshot is reused for its TTL, not rebuilt per request."""
+
+import asyncio
+
+import pytest
+
+from app.snapshot import Snapshot, SnapshotCache
+
+pytestmark = pytest.mark.anyio
+
+
+class Builder:
+    def __init__(self):
+        self.builds = 0
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, session) -> Snapshot:
+        self.builds += 1
+        await self.release.wait()
+        return Snapshot(b'{"build": %d}' % self.builds)
+
+
+async def test_snapshot_is_reused_within_ttl_without_listen():
+    build = Builder()
+    cache = SnapshotCache(build, ttl=60)
+
+    first = await cache.get(None)
+    assert await cache.get(None) is first
+    assert build.builds == 1
+    assert first.best is False
+
+    cache.invalidate()
+    assert await cache.get(None) is not first
+    assert build.builds == 2
+
+
+async def test_stale_snapshot_is_served_while_rebuilding():
+    build = Builder()
+    cache = SnapshotCache(build, ttl=0)
+    stale = await cache.get(None)
+
+    build.release.clear()
+    rebuild = asyncio.create_task(cache.get(None))
+    await asyncio.sleep(0)
+    # the rebuild holds the lock; other readers get the previous snapshot
+    assert await asyncio.wait_for(cache.get(None), 1) is stale
+
+    build.release.set()
+    fresh = await rebuild
+    assert fresh is not stale
+    assert build.builds == 2
+
+
+async def test_listen_keeps_snapshot_until_invalidated():
+    build = Builder()
+    cache = SnapshotCache(build, ttl=0)
+    cache.ready = True
+
+    first = await cache.get(None)
+    assert await cache.get(None) is first
+    assert first.best is True
+    assert build.builds == 1
@@ -0,0 +1,56 @@
+"""Concurrent reserves of one table: exactly one wins, the rest get 409."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import delete, insert, select
+
+from app.database import SessionLocal
+from app.models import DiningTable
+from app.routers.dining_table import reserve_table
+
+pytestmark = pytest.mark.anyio
+
+CLIENTS = 20
+
+
+async def _reserve(start: asyncio.Event, table_id: int) -> int:
+    await start.wait()
+    async with SessionLocal() as session:
+        try:
+            await reserve_table(session, table_id)
+        except HTTPException as e:
+            return e.status_code
+    return 200
+
+
+async def test_one_of_concurrent_reserves_succeeds(db):
+    async with SessionLocal() as session:
+        table_id = await session.scalar(
+            insert(DiningTable)
+            .values(table_no="test-race", capacity=4, status="free", version=0)
+            .returning(DiningTable.id)
+        )
+        await session.commit()
+    try:
+        start = asyncio.Event()
+        tasks = [asyncio.create_task(_reserve(start, table_id)) for _ in range(CLIENTS)]
+        await asyncio.sleep(0)
+        start.set()
+        codes = sorted(await asyncio.gather(*tasks))
+
+        assert codes == [200] + [409] * (CLIENTS - 1)
+        async with SessionLocal() as session:
+            row = (
+                await session.execute(
+                    select(DiningTable.status, DiningTable.version).where(
+                        DiningTable.id == table_id
+                    )
+                )
+            ).one()
+        assert tuple(row) == ("reserved", 1)
+    finally:
+        async with SessionLocal() as session:
+            await session.execute(delete(DiningTable).where(DiningTable.id == table_id))
+            await session.commit()